@@ -0,0 +1,88 @@
+"""
+Equivalence check and latency benchmark: sklearn TfidfVectorizer vs FastTfidfVectorizer
+
+Usage:
+    python benchmarks/bench_fast_tfidf.py [documents]
+"""
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.fast_tfidf import FastTfidfVectorizer
+from core.predictor import smart_predictor
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+TITLES = [
+    "Apple iPhone 14 Pro Max 256GB Deep Purple",
+    "Samsung 55 inch QLED Smart TV with Alexa",
+    "Organic cold brew coffee concentrate, 32 fl oz",
+    "Dell XPS 13 laptop, 16GB RAM, 512GB SSD, professional edition",
+    "Nike Air Zoom Pegasus running shoes, men's size 10",
+]
+
+
+def load_documents(count):
+    """Catalog texts from the test set when present, otherwise sample titles"""
+    path = BACKEND_DIR / 'data' / 'test.csv'
+    if path.exists():
+        docs = pd.read_csv(path, nrows=count, usecols=['catalog_content'])['catalog_content'].fillna('').tolist()
+    else:
+        docs = [f"{TITLES[i % len(TITLES)]} item {i}" for i in range(count)]
+    return [smart_predictor.preprocess_text(doc) for doc in docs] + ['', 'Crème brûlée café']
+
+
+def identical(a, b):
+    a, b = a.tocsr(), b.tocsr()
+    return (a.shape == b.shape and np.array_equal(a.indptr, b.indptr)
+            and np.array_equal(a.indices, b.indices) and np.array_equal(a.data, b.data))
+
+
+def per_call(fn, docs):
+    start = time.perf_counter()
+    for doc in docs:
+        fn([doc])
+    return (time.perf_counter() - start) / len(docs)
+
+
+def batch(fn, docs):
+    start = time.perf_counter()
+    fn(docs)
+    return (time.perf_counter() - start) / len(docs)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    with open(BACKEND_DIR / 'models' / 'tfidf_vectorizer.pkl', 'rb') as f:
+        sklearn_vectorizer = pickle.load(f)
+    fast = FastTfidfVectorizer.from_sklearn(sklearn_vectorizer)
+    docs = load_documents(count)
+    titles = [smart_predictor.preprocess_text(t) for t in TITLES]
+
+    # Equivalence: bit-identical CSR output, one document at a time and in batch
+    assert identical(sklearn_vectorizer.transform(docs), fast.transform(docs))
+    for doc in docs[::max(1, len(docs) // 500)] + titles:
+        assert identical(sklearn_vectorizer.transform([doc]), fast.transform([doc]))
+    print(f"✅ Identical output on {len(docs):,} documents")
+
+    single_titles = titles * 400
+    print(f"{'':24s}{'sklearn':>12s}{'fast':>12s}")
+    for label, fn_sklearn, fn_fast, data in (
+        ('short title, per call', sklearn_vectorizer.transform, fast.transform, single_titles),
+        ('catalog doc, per call', sklearn_vectorizer.transform, fast.transform, docs[:2000]),
+    ):
+        before, after = per_call(fn_sklearn, data), per_call(fn_fast, data)
+        print(f"{label:24s}{before * 1e6:9.1f} us{after * 1e6:9.1f} us   ({before / after:.1f}x)")
+
+    before, after = batch(sklearn_vectorizer.transform, docs), batch(fast.transform, docs)
+    print(f"{'batch, per document':24s}{before * 1e6:9.1f} us{after * 1e6:9.1f} us   ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
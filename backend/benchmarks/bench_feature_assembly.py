@@ -0,0 +1,161 @@
+"""
+Benchmark: memory traced by tracemalloc and time per model-input build, hstack vs FeatureAssembler
+
+The hstack version is the previous _feature_matrix. Both build the same
+matrix from the same extracted features; outputs are compared first.
+"assembly" times only combining the text vector with the numeric tail;
+"end to end" includes TF-IDF vectorization. Peak bytes are measured with
+tracemalloc around a single build, after a warm-up call has sized the
+assembler's buffers; "blocks held" counts the memory blocks a build
+allocates and still holds when it returns (tracemalloc snapshot diff).
+The run fails unless single-row assembly uses at least 10x less peak
+memory, fewer blocks and less time (tests/test_feature_assembly.py holds
+the same peak-memory bound). Batched assembly allocates its output at final size
+but is otherwise about as costly as hstack (peak within 1.0-1.2x).
+
+Usage:
+    python benchmarks/bench_feature_assembly.py [repeats]
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from scipy.sparse import csr_matrix, hstack
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.predictor import smart_predictor
+
+TITLES = [
+    "Apple iPhone 14 Pro Max 256GB Deep Purple",
+    "Samsung 55 inch QLED Smart TV with Alexa",
+    "Organic cold brew coffee concentrate, 32 fl oz",
+    "Dell XPS 13 laptop, 16GB RAM, 512GB SSD, professional edition",
+    "",
+]
+
+
+def text_inputs(features, bundle):
+    """What the vectorizer hands to assembly: a text row or matrix, plus the tail values"""
+    tail = np.column_stack([
+        [f.text_len for f in features],
+        [f.word_count for f in features],
+        bundle.brand_vocabulary.encode_batch([f.brand for f in features]),
+        [f.has_quality for f in features]
+    ])
+    if len(features) == 1:
+        indices, values = bundle.text_vectorizer.row(features[0].combined_text)
+        text = csr_matrix((np.array(values), np.array(indices, dtype=np.int32), np.array([0, len(indices)], dtype=np.int32)),
+                          shape=(1, bundle.assembler.n_text_features))
+        return text, tail, (indices, values, tuple(tail[0].tolist()))
+    return bundle.text_vectorizer.transform([f.combined_text for f in features]), tail, None
+
+
+def hstack_assembly(text, tail, row_inputs, bundle):
+    """Assembly as done before FeatureAssembler"""
+    return hstack([text, csr_matrix(tail)], format='csr')
+
+
+def buffer_assembly(text, tail, row_inputs, bundle):
+    if row_inputs is not None:
+        return bundle.assembler.row(*row_inputs)
+    return bundle.assembler.rows(text, tail.astype(np.float64))
+
+
+def hstack_matrix(features, bundle):
+    """Model input as built before FeatureAssembler, vectorization included"""
+    text_features = bundle.text_vectorizer.transform([f.combined_text for f in features])
+    brand_encoded = bundle.brand_vocabulary.encode_batch([f.brand for f in features])
+    numerical_features = np.column_stack([
+        [f.text_len for f in features],
+        [f.word_count for f in features],
+        brand_encoded,
+        [f.has_quality for f in features]
+    ])
+    return hstack([text_features, csr_matrix(numerical_features)], format='csr')
+
+
+def assembled_matrix(features, bundle):
+    return smart_predictor._feature_matrix(features, bundle)
+
+
+def same_matrix(a, b):
+    return (a.shape == b.shape and np.array_equal(a.indptr, b.indptr)
+            and np.array_equal(a.indices, b.indices) and np.array_equal(a.data, b.data))
+
+
+def peak_bytes(build, *args):
+    build(*args)
+    tracemalloc.start()
+    build(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def allocated_blocks(build, *args):
+    """Memory blocks a call allocates and still holds on return, its result included"""
+    build(*args)
+    tracemalloc.start()
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    before = tracemalloc.take_snapshot().filter_traces(ignore)
+    result = build(*args)
+    after = tracemalloc.take_snapshot().filter_traces(ignore)
+    tracemalloc.stop()
+    del result
+    return sum(stat.count_diff for stat in after.compare_to(before, 'lineno') if stat.count_diff > 0)
+
+
+def seconds_per_call(build, args, repeats):
+    build(*args)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        build(*args)
+    return (time.perf_counter() - start) / repeats
+
+
+def report(label, rows, old, new, args, repeats):
+    old_peak, new_peak = peak_bytes(old, *args), peak_bytes(new, *args)
+    old_blocks, new_blocks = allocated_blocks(old, *args), allocated_blocks(new, *args)
+    calls = max(10, repeats // rows)
+    old_time, new_time = seconds_per_call(old, args, calls), seconds_per_call(new, args, calls)
+    print(f"{label:12s}{rows:6d}{old_peak / 1024:12.2f}KB{new_peak / 1024:10.2f}KB{old_peak / new_peak:7.1f}x"
+          f"{old_blocks:9d}{new_blocks:9d}{old_time * 1e6:10.0f}µs{new_time * 1e6:10.0f}µs")
+    return old_peak / new_peak, old_blocks, new_blocks, old_time / new_time
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    if not smart_predictor.load_models():
+        sys.exit("❌ Model artifacts not found")
+    bundle = smart_predictor.bundle
+    if not hasattr(bundle.text_vectorizer, 'row'):
+        sys.exit("❌ Needs the vocabulary TF-IDF with the fast vectorizer")
+
+    print(f"{'':12s}{'':6s}{'peak traced memory':>33s}{'blocks held':>18s}{'time per call':>22s}")
+    print(f"{'stage':12s}{'rows':>6s}{'hstack':>14s}{'buffers':>12s}{'ratio':>8s}"
+          f"{'hstack':>9s}{'buffers':>9s}{'hstack':>12s}{'buffers':>12s}")
+    for rows in (1, 32, 256):
+        features = [
+            smart_predictor.extract_features(TITLES[i % len(TITLES)], f"item {i}" if i % 3 else "")
+            for i in range(rows)
+        ]
+        if not same_matrix(hstack_matrix(features, bundle), assembled_matrix(features, bundle)):
+            sys.exit(f"❌ Assembled matrix differs from hstack for {rows} rows")
+
+        inputs = text_inputs(features, bundle)
+        assembly = report('assembly', rows, hstack_assembly, buffer_assembly, (*inputs, bundle), repeats)
+        report('end to end', rows, hstack_matrix, assembled_matrix, (features, bundle), repeats)
+
+        # Single rows are what FeatureAssembler targets; batches only skip hstack's intermediates
+        if rows == 1:
+            peak_ratio, old_blocks, new_blocks, speedup = assembly
+            if peak_ratio < 10 or new_blocks >= old_blocks or speedup < 1:
+                sys.exit(f"❌ Single-row assembly is not cheaper: {peak_ratio:.1f}x peak, "
+                         f"{old_blocks} -> {new_blocks} blocks, {speedup:.1f}x time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: per-request cost of three feature passes vs one shared bundle
+
+Usage:
+    python benchmarks/bench_feature_bundle.py [requests]
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.predictor import SmartPricePredictor
+
+TITLES = [
+    "Apple iPhone 14 Pro Max 256GB Deep Purple",
+    "Samsung 55 inch QLED Smart TV with Alexa",
+    "Organic cold brew coffee concentrate, 32 fl oz",
+    "Dell XPS 13 laptop, 16GB RAM, 512GB SSD, professional edition",
+    "Nike Air Zoom Pegasus running shoes, men's size 10",
+]
+DESCRIPTION = "Latest generation model with premium build quality and extended warranty " * 3
+
+
+def three_pass(predictor, title):
+    """Request path before the shared feature bundle"""
+    return (
+        predictor.predict_price(title, DESCRIPTION),
+        predictor.get_confidence(title, DESCRIPTION),
+        predictor.get_key_features(title, DESCRIPTION)
+    )
+
+
+def single_pass(predictor, title):
+    result = predictor.predict(title, DESCRIPTION)
+    return result['predicted_price'], result['confidence_score'], result['key_features']
+
+
+def timed(fn, predictor, requests):
+    start = time.perf_counter()
+    for i in range(requests):
+        fn(predictor, TITLES[i % len(TITLES)])
+    return (time.perf_counter() - start) / requests
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    predictor = SmartPricePredictor()
+    modes = [('heuristic', predictor)]
+
+    loaded = SmartPricePredictor()
+    if loaded.load_models():
+        modes.append(('ml', loaded))
+
+    for mode, instance in modes:
+        for title in TITLES:
+            assert three_pass(instance, title) == single_pass(instance, title)
+
+        n = requests if mode == 'heuristic' else max(1, requests // 20)
+        before = timed(three_pass, instance, n)
+        after = timed(single_pass, instance, n)
+        print(f"[{mode}] {n:,} requests")
+        print(f"  three feature passes: {before * 1e6:9.1f} us/request")
+        print(f"  shared bundle:        {after * 1e6:9.1f} us/request")
+        print(f"  saved:                {(before - after) * 1e6:9.1f} us/request ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
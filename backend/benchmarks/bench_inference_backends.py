@@ -0,0 +1,77 @@
+"""
+Benchmark: single-row and batch model latency of each inference backend
+
+Feature matrices are built once with the loaded artifacts, so only the
+model call is timed. Every backend's output is compared with the sklearn
+estimator's before timing.
+
+Usage:
+    python benchmarks/bench_inference_backends.py [repeats] [num_threads]
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.inference_backends import BoosterBackend, SklearnBackend
+from core.predictor import smart_predictor
+
+TITLES = [
+    "Apple iPhone 14 Pro Max 256GB Deep Purple",
+    "Samsung 55 inch QLED Smart TV with Alexa",
+    "Organic cold brew coffee concentrate, 32 fl oz",
+    "Dell XPS 13 laptop, 16GB RAM, 512GB SSD, professional edition",
+    "Nike Air Zoom Pegasus running shoes, men's size 10",
+]
+
+
+def latency(predict, X, repeats):
+    """Median seconds per call"""
+    predict(X)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(X)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    num_threads = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    if not smart_predictor.load_models():
+        sys.exit("❌ Model artifacts not found")
+    bundle = smart_predictor.bundle
+
+    backends = [SklearnBackend(bundle.model)]
+    try:
+        backends.append(BoosterBackend(bundle.model, num_threads=num_threads))
+    except (ImportError, ValueError) as e:
+        print(f"⚠️ Booster backend unavailable: {e}")
+
+    print(f"{'batch':>6s}" + ''.join(f"{b.name:>14s}" for b in backends) + f"{'speedup':>10s}")
+    for batch_size in (1, 8, 64, 512):
+        features = [
+            smart_predictor.extract_features(f"{TITLES[i % len(TITLES)]} {i}", "new in box")
+            for i in range(batch_size)
+        ]
+        X = smart_predictor._feature_matrix(features, bundle)
+
+        reference = backends[0].predict(X)
+        for backend in backends[1:]:
+            if not np.array_equal(backend.predict(X), reference):
+                sys.exit(f"❌ {backend.name} predictions differ from sklearn")
+
+        calls = max(5, repeats // max(1, batch_size // 8))
+        timings = [latency(b.predict, X, calls) for b in backends]
+        print(f"{batch_size:6d}" + ''.join(f"{t * 1e6:12.0f}µs" for t in timings)
+              + f"{timings[0] / timings[-1]:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: linear substring scan vs compiled keyword matcher as the brand list grows
+
+Usage:
+    python benchmarks/bench_keyword_matcher.py [texts]
+"""
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.keywords import PRODUCT_BRANDS, KeywordMatcher
+from core.predictor import smart_predictor
+
+TITLES = [
+    "Apple iPhone 14 Pro Max 256GB Deep Purple",
+    "Samsung 55 inch QLED Smart TV with Alexa",
+    "Organic cold brew coffee concentrate, 32 fl oz",
+    "Dell XPS 13 laptop, 16GB RAM, 512GB SSD, professional edition",
+    "Nike Air Zoom Pegasus running shoes, men's size 10",
+    "PHP programming guide, product handbook for developers",
+]
+
+
+def make_brands(count, seed=7):
+    """Known brands followed by random brand-like names"""
+    rng = random.Random(seed)
+    brands = list(PRODUCT_BRANDS)
+    while len(brands) < count:
+        brands.append(''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))))
+    return brands[:count]
+
+
+def linear_scan(brands, text):
+    """Brand detection before the shared matcher"""
+    for brand in brands:
+        if brand in text:
+            return brand
+    return 'unknown'
+
+
+def timed(fn, texts):
+    start = time.perf_counter()
+    for text in texts:
+        fn(text)
+    return (time.perf_counter() - start) / len(texts)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    texts = [smart_predictor.preprocess_text(TITLES[i % len(TITLES)], f"item {i}") for i in range(count)]
+
+    print(f"{count:,} texts")
+    print(f"{'brands':>8}  {'linear scan':>12}  {'matcher':>10}  {'compile':>9}")
+    for size in (10, 100, 1_000, 10_000, 50_000):
+        brands = make_brands(size)
+        start = time.perf_counter()
+        matcher = KeywordMatcher(brands)
+        compile_time = time.perf_counter() - start
+
+        n = count if size <= 1_000 else max(200, count // 20)
+        linear = timed(lambda text: linear_scan(brands, text), texts[:n])
+        compiled = timed(lambda text: matcher.best(text) or 'unknown', texts[:n])
+        print(f"{size:>8,}  {linear * 1e6:9.1f} us  {compiled * 1e6:7.1f} us  {compile_time:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
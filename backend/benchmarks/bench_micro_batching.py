@@ -0,0 +1,75 @@
+"""
+Benchmark: concurrent single predictions with and without micro-batching
+
+Usage:
+    python benchmarks/bench_micro_batching.py [requests] [concurrency] [max_wait_ms]
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.predictor import smart_predictor
+from services.inference_pool import InferencePool
+from services.micro_batcher import MicroBatcher
+
+TITLES = [
+    "Apple iPhone 14 Pro Max 256GB Deep Purple",
+    "Samsung 55 inch QLED Smart TV with Alexa",
+    "Organic cold brew coffee concentrate, 32 fl oz",
+    "Dell XPS 13 laptop, 16GB RAM, 512GB SSD, professional edition",
+    "Nike Air Zoom Pegasus running shoes, men's size 10",
+]
+
+
+async def run(score, requests, concurrency):
+    """Drive `requests` predictions from `concurrency` client coroutines"""
+    latencies = []
+    counter = iter(range(requests))
+
+    async def client():
+        for i in counter:
+            features = smart_predictor.extract_features(f"{TITLES[i % len(TITLES)]} #{i}")
+            start = time.perf_counter()
+            await score(features)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return requests / elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+
+async def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    max_wait_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+
+    mode = 'ml' if smart_predictor.load_models() else 'heuristic'
+    pool = InferencePool(max_queue=concurrency)
+    batcher = MicroBatcher(pool, max_batch_size=32, max_wait_ms=max_wait_ms)
+
+    # Batched and unbatched scoring must agree
+    features = [smart_predictor.extract_features(title) for title in TITLES]
+    assert await asyncio.gather(*(batcher.submit(f) for f in features)) == \
+        [smart_predictor.predict_from_features(f) for f in features]
+    batcher.stats.reset()
+
+    print(f"[{mode}] {requests:,} requests, {concurrency} concurrent clients, window {max_wait_ms:g} ms")
+    for label, score in (('per-request', pool.predict), ('micro-batched', batcher.submit)):
+        throughput, p50, p99 = await run(score, requests, concurrency)
+        print(f"  {label:14s} {throughput:9.0f} req/s   p50 {p50 * 1e3:7.2f} ms   p99 {p99 * 1e3:7.2f} ms")
+
+    stats = batcher.get_stats()
+    print(f"  batches: {stats['batches']:,}  mean size {stats['batch_size']['mean']}  "
+          f"p99 queue wait {stats['queue_wait_seconds']['p99'] * 1e3:.2f} ms")
+
+    await batcher.stop()
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""
+Benchmark: peak memory traced by tracemalloc and time to fit the TF-IDF vocabulary, in memory vs out of core
+
+"in-memory" reads the whole CSV and runs TfidfVectorizer.fit on every
+cleaned text, as build_training_matrix does on first use. "out-of-core" is
+DataProcessor.fit_text_vectorizer_out_of_core streaming the same CSV in
+chunks. Inputs repeat data/test.csv rows with a few rare made-up tokens
+per row, so the full bigram vocabulary keeps growing with the input the
+way a real catalog's does. The fitted vocabularies are compared.
+
+Usage:
+    python benchmarks/bench_out_of_core_tfidf.py [rows] [chunk rows]
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.processor import DataProcessor
+
+
+def write_catalog(path, rows):
+    test_csv = Path(__file__).resolve().parent.parent / 'data' / 'test.csv'
+    if test_csv.exists():
+        base = pd.read_csv(test_csv)['catalog_content'].fillna('')
+    else:
+        base = pd.Series([f"Premium Apple product {i} with {i % 64}GB storage" for i in range(10_000)])
+    titles = pd.concat([base] * (rows // len(base) + 1), ignore_index=True).iloc[:rows]
+    rng = np.random.default_rng(0)
+    rare = rng.integers(0, rows * 10, size=(rows, 4))
+    titles = titles + [' ' + ' '.join(f"sku{n}" for n in row) for row in rare]
+    pd.DataFrame({'title': titles, 'description': '', 'price': rng.uniform(5, 500, rows)}).to_csv(path, index=False)
+
+
+def in_memory(path, chunk_rows):
+    processor = DataProcessor()
+    processor.text_features_matrix(processor.combined_text(pd.read_csv(path)), dtype=np.float32)
+    return processor.tfidf_vectorizer
+
+
+def out_of_core(path, chunk_rows):
+    return DataProcessor().fit_text_vectorizer_out_of_core(path, chunk_rows=chunk_rows)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    chunk_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'train.csv'
+        write_catalog(path, rows)
+
+        print(f"{rows:,} rows, chunks of {chunk_rows:,}")
+        print(f"{'method':>12s}{'peak':>11s}{'time':>9s}{'terms':>8s}")
+        vocabularies = {}
+        for name, fit in (('in-memory', in_memory), ('out-of-core', out_of_core)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            vectorizer = fit(path, chunk_rows)
+            seconds = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            vocabularies[name] = set(vectorizer.vocabulary_)
+            print(f"{name:>12s}{peak / 2**20:9.1f}MB{seconds:8.1f}s{len(vectorizer.vocabulary_):8d}")
+
+    shared = len(vocabularies['in-memory'] & vocabularies['out-of-core'])
+    print(f"shared terms: {shared:,} of {len(vocabularies['in-memory']):,} "
+          f"(differences are ties in frequency at the max_features cut)")
+
+
+if __name__ == "__main__":
+    main()
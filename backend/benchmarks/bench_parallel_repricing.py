@@ -0,0 +1,67 @@
+"""
+Benchmark: offline repricing throughput (rows/second) against the number of worker processes
+
+Every run scores the same input with reprice_csv and checks the output
+matches the single-process run row for row. Times include starting the
+workers and loading their artifacts. Scaling is bounded by the cores
+available (reported first).
+
+Usage:
+    python benchmarks/bench_parallel_repricing.py [rows] [chunk rows] [max workers]
+"""
+import filecmp
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from core.predictor import smart_predictor
+from core.repricing import reprice_csv
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 40_000
+    chunk_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else max(4, cores)
+
+    smart_predictor.load_models()
+    test_csv = BACKEND_DIR / 'data' / 'test.csv'
+    if test_csv.exists():
+        data = pd.read_csv(test_csv, nrows=rows)
+    else:
+        data = pd.DataFrame({
+            'sample_id': range(rows),
+            'catalog_content': [f"Premium product {i} with {i % 64}GB storage" for i in range(rows)]
+        })
+
+    print(f"{cores} core(s) available, {len(data):,} rows, chunks of {chunk_rows:,}")
+    print(f"{'workers':>8s}{'seconds':>10s}{'rows/s':>12s}{'speedup':>10s}")
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = Path(tmp) / 'input.csv'
+        data.to_csv(input_path, index=False)
+
+        reference, baseline = None, None
+        workers = 1
+        while workers <= max_workers:
+            output_path = Path(tmp) / f'predictions_{workers}.csv'
+            start = time.perf_counter()
+            reprice_csv(input_path, output_path, smart_predictor, chunk_rows=chunk_rows, workers=workers)
+            elapsed = time.perf_counter() - start
+
+            if reference is None:
+                reference, baseline = output_path, elapsed
+            elif not filecmp.cmp(reference, output_path, shallow=False):
+                sys.exit(f"❌ Output with {workers} workers differs from the single-process run")
+            print(f"{workers:8d}{elapsed:10.2f}{len(data) / elapsed:12,.0f}{baseline / elapsed:9.2f}x")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
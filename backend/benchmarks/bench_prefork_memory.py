@@ -0,0 +1,106 @@
+"""
+Benchmark: per-worker memory and startup time with and without model preloading
+
+Starts serve_prefork.py once with --no-preload (every worker loads its own
+models, like separate uvicorn workers) and once with the models preloaded in
+the master, sends a few predictions, then reads /proc/<pid>/smaps_rollup of
+every worker. USS (private pages) is what each extra worker really costs;
+PSS splits shared pages between the processes that map them.
+
+Usage:
+    python benchmarks/bench_prefork_memory.py [workers] [port]
+"""
+import json
+import queue
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+READY = re.compile(r"Worker (\d+) ready in ([\d.]+)s")
+MASTER = re.compile(r"Master (\d+) serving")
+
+
+def smaps_rollup(pid: int) -> dict:
+    """Memory counters of one process in bytes"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1]) * 1024
+    values['USS'] = values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+    return values
+
+
+def predict(port: int, title: str):
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/predict", data=json.dumps({'title': title}).encode(),
+        headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.load(response)
+
+
+def measure(workers: int, port: int, preload: bool, timeout: float = 90.0) -> dict:
+    command = [sys.executable, '-W', 'ignore', 'serve_prefork.py', '--workers', str(workers), '--port', str(port)]
+    if not preload:
+        command.append('--no-preload')
+    started = time.perf_counter()
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+    lines = queue.Queue()
+    threading.Thread(target=lambda: [lines.put(line) for line in server.stdout], daemon=True).start()
+
+    master, ready = None, {}
+    try:
+        deadline = started + timeout
+        while len(ready) < workers:
+            line = lines.get(timeout=max(0.1, deadline - time.perf_counter()))
+            if (match := MASTER.search(line)):
+                master = int(match.group(1))
+            if (match := READY.search(line)):
+                ready[int(match.group(1))] = float(match.group(2))
+        all_ready = time.perf_counter() - started
+
+        for i in range(workers * 20):
+            predict(port, f"Apple iPhone {i} Pro 256GB")
+        time.sleep(1.0)
+
+        memory = {pid: smaps_rollup(pid) for pid in ready}
+        return {
+            'all_ready_seconds': all_ready,
+            'worker_ready_seconds': sum(ready.values()) / workers,
+            'uss': sum(m['USS'] for m in memory.values()) / workers,
+            'pss': sum(m['Pss'] for m in memory.values()) / workers,
+            'rss': sum(m['Rss'] for m in memory.values()) / workers,
+            'total_pss': sum(m['Pss'] for m in memory.values()) + (smaps_rollup(master)['Pss'] if master else 0)
+        }
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 5099
+    mb = 2 ** 20
+
+    print(f"{'mode':14s}{'startup':>10s}{'per worker':>12s}{'USS':>10s}{'PSS':>10s}{'RSS':>10s}{'total PSS':>12s}")
+    for preload in (False, True):
+        result = measure(workers, port, preload)
+        print(f"{'preloaded' if preload else 'per-worker':14s}{result['all_ready_seconds']:9.2f}s"
+              f"{result['worker_ready_seconds']:11.3f}s{result['uss'] / mb:8.1f}MB{result['pss'] / mb:8.1f}MB"
+              f"{result['rss'] / mb:8.1f}MB{result['total_pss'] / mb:10.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: peak RSS of streaming repricing vs loading the whole CSV, at growing input sizes
+
+Each run happens in a fresh interpreter so ru_maxrss is that run's peak.
+Inputs are built by repeating the rows of data/test.csv (or synthetic
+titles when it is missing). Streaming peak memory should stay flat as the
+input grows; the whole-file approach grows with it.
+
+Usage:
+    python benchmarks/bench_repricing.py [base rows] [chunk rows]
+"""
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+RUNNER = r'''
+import json, resource, sys, time, warnings
+warnings.filterwarnings('ignore')
+sys.path.insert(0, sys.argv[4])
+import pandas as pd
+from core.predictor import smart_predictor
+from core.repricing import reprice_csv
+
+smart_predictor.load_models()
+mode, input_path, output_path, chunk_rows = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[5])
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.time()
+if mode == 'streaming':
+    reprice_csv(input_path, output_path, smart_predictor, chunk_rows=chunk_rows)
+else:
+    df = pd.read_csv(input_path)
+    features = [smart_predictor.extract_features(t) for t in df['catalog_content'].fillna('')]
+    df['predicted_price'] = smart_predictor.predict_price_batch(features)
+    df[['sample_id', 'predicted_price']].to_csv(output_path, index=False)
+print(json.dumps({'peak_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                  'baseline_kb': baseline, 'seconds': time.time() - start}))
+'''
+
+
+def run(mode, input_path, output_path, chunk_rows):
+    output = subprocess.run(
+        [sys.executable, '-c', RUNNER, mode, str(input_path), str(output_path), str(BACKEND_DIR), str(chunk_rows)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    base_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    chunk_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    test_csv = BACKEND_DIR / 'data' / 'test.csv'
+    if test_csv.exists():
+        base = pd.read_csv(test_csv, nrows=base_rows)
+    else:
+        base = pd.DataFrame({
+            'sample_id': range(base_rows),
+            'catalog_content': [f"Premium product {i} with {i % 64}GB storage" for i in range(base_rows)]
+        })
+
+    print(f"{'rows':>8s}{'mode':>12s}{'peak RSS':>12s}{'over load':>12s}{'time':>9s}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in (1, 2, 4):
+            input_path = Path(tmp) / f'input_{factor}.csv'
+            pd.concat([base] * factor, ignore_index=True).to_csv(input_path, index=False)
+            for mode in ('whole-file', 'streaming'):
+                result = run(mode, input_path, Path(tmp) / 'predictions.csv', chunk_rows)
+                print(f"{base_rows * factor:8d}{mode:>12s}{result['peak_kb'] / 1024:10.1f}MB"
+                      f"{(result['peak_kb'] - result['baseline_kb']) / 1024:10.1f}MB{result['seconds']:8.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: load time and per-worker memory of the vocabulary TF-IDF vs hashed TF-IDF
+
+Each artifact is loaded in a fresh interpreter, so the numbers reflect what
+one worker pays at startup.
+
+Usage:
+    python benchmarks/bench_text_features.py [training documents]
+"""
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from core.hashed_tfidf import HashedTfidfVectorizer
+
+LOADER = r'''
+import json, os, pickle, sys, time
+sys.path.insert(0, sys.argv[3])
+
+def rss():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+from core.hashed_tfidf import HashedTfidfVectorizer
+before, start = rss(), time.perf_counter()
+if sys.argv[1] == 'vocabulary':
+    with open(sys.argv[2], 'rb') as f:
+        vectorizer = pickle.load(f)
+else:
+    vectorizer = HashedTfidfVectorizer.load(sys.argv[2])
+elapsed = time.perf_counter() - start
+loaded = rss()
+vectorizer.transform(['apple iphone 14 pro max 256gb'])
+print(json.dumps({'load_seconds': elapsed, 'rss_bytes': loaded - before, 'rss_after_transform': rss() - before}))
+'''
+
+
+def measure(mode, path):
+    output = subprocess.run(
+        [sys.executable, '-W', 'ignore', '-c', LOADER, mode, str(path), str(BACKEND_DIR)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    test_csv = BACKEND_DIR / 'data' / 'test.csv'
+    vocabulary_path = BACKEND_DIR / 'models' / 'tfidf_vectorizer.pkl'
+
+    if test_csv.exists():
+        docs = pd.read_csv(test_csv, nrows=count, usecols=['catalog_content'])['catalog_content'].fillna('')
+    else:
+        docs = pd.Series([f"product {i} with words {i % 997} and {i % 113}" for i in range(count)])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        hashed_path = Path(tmp) / 'hashed_tfidf.json'
+        HashedTfidfVectorizer(ngram_range=(1, 3)).fit(docs).save(hashed_path)
+
+        print(f"{'artifact':28s}{'size':>10s}{'load':>10s}{'RSS':>10s}{'RSS+1 call':>12s}")
+        for mode, path, files in (
+            ('vocabulary', vocabulary_path, [vocabulary_path]),
+            ('hashing', hashed_path, [hashed_path, hashed_path.with_suffix('.idf.npy')]),
+        ):
+            size = sum(f.stat().st_size for f in files)
+            result = measure(mode, path)
+            print(f"{mode:28s}{size / 2 ** 20:8.2f}MB{result['load_seconds'] * 1e3:8.1f}ms"
+                  f"{result['rss_bytes'] / 2 ** 20:8.2f}MB{result['rss_after_transform'] / 2 ** 20:10.2f}MB")
+
+
+if __name__ == "__main__":
+    main()
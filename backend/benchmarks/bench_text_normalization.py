@@ -0,0 +1,63 @@
+"""
+Benchmark: DataProcessor text cleaning, per-row regex apply vs normalize_series
+
+The apply version is the previous clean_text (two re.sub passes per row).
+Texts come from data/test.csv catalog_content, repeated to the requested
+size the way a training set repeats listings; outputs are compared first.
+Also reports normalize_series on fully distinct texts, where deduplication
+cannot help and only the translate-table fast path counts.
+
+Usage:
+    python benchmarks/bench_text_normalization.py [rows] [workers]
+"""
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.text_normalization import normalize_series
+
+
+def legacy_clean_text(text):
+    if pd.isna(text):
+        return ""
+    text = str(text).lower()
+    text = re.sub(r'[^a-zA-Z0-9\s]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    test_csv = Path(__file__).resolve().parent.parent / 'data' / 'test.csv'
+    if test_csv.exists():
+        base = pd.read_csv(test_csv)['catalog_content']
+    else:
+        base = pd.Series([f"Premium Café product {i}, {i % 64}GB (Pack of {i % 6})" for i in range(10_000)])
+    repeated = pd.concat([base] * (rows // len(base) + 1), ignore_index=True).iloc[:rows]
+    distinct = repeated.fillna('') + ' #' + repeated.index.astype(str)
+
+    print(f"{rows:,} rows, {repeated.nunique():,} distinct, workers={workers}")
+    print(f"{'input':>10s}{'apply':>10s}{'normalize':>12s}{'speedup':>9s}")
+    for name, texts in (('repeated', repeated), ('distinct', distinct)):
+        expected, legacy_seconds = timed(texts.apply, legacy_clean_text)
+        actual, new_seconds = timed(normalize_series, texts, workers=workers)
+        mismatches = int((expected.astype(object) != actual).sum())
+        if mismatches:
+            raise SystemExit(f"❌ {mismatches} rows differ from the legacy cleaning on {name} input")
+        print(f"{name:>10s}{legacy_seconds:9.2f}s{new_seconds:11.2f}s{legacy_seconds / new_seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
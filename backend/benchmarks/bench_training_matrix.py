@@ -0,0 +1,111 @@
+"""
+Benchmark: peak memory traced by tracemalloc and time to build the training matrix
+
+"prepare + hstack" is the previous path (the removed
+DataProcessor.extract_features and prepare_training_data, kept here as
+legacy_prepare): it adds feature columns to the frame, copies them with
+.values, and the caller stacks X_text, X_brand and X_numerical into one
+float64 matrix. "build" is
+DataProcessor.build_training_matrix writing one float32 CSR matrix in the
+serving column layout. Both reuse a vectorizer fitted beforehand, so only
+matrix construction is measured. The build output is also checked against
+the serving path's _feature_matrix.
+
+Usage:
+    python benchmarks/bench_training_matrix.py [rows]
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import hstack
+from sklearn.preprocessing import LabelEncoder
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.predictor import ModelBundle, SmartPricePredictor
+from core.processor import DataProcessor
+from core.text_normalization import normalize_series
+
+
+def load_frame(rows):
+    test_csv = Path(__file__).resolve().parent.parent / 'data' / 'test.csv'
+    if test_csv.exists():
+        titles = pd.read_csv(test_csv, nrows=rows)['catalog_content'].fillna('')
+    else:
+        titles = pd.Series([f"Premium Apple product {i} with {i % 64}GB storage" for i in range(rows)])
+    return pd.DataFrame({'title': titles, 'description': ''})
+
+
+def legacy_extract_features(df):
+    """The former DataProcessor.extract_features"""
+    df['title_clean'] = normalize_series(df['title'])
+    df['description_clean'] = normalize_series(df['description'])
+    df['combined_text'] = df['title_clean'] + ' ' + df['description_clean']
+    df['text_length'] = df['combined_text'].str.len()
+    df['word_count'] = df['combined_text'].str.split().str.len()
+    df['title_length'] = df['title_clean'].str.len()
+    df['brand'] = df['title_clean'].str.extract(r'(apple|samsung|sony|nike|adidas|lg|hp|dell|lenovo|asus)', expand=False)
+    df['brand'] = df['brand'].fillna('unknown')
+    quality_words = ['premium', 'luxury', 'professional', 'pro', 'ultra', 'max', 'deluxe', 'elite']
+    df['has_quality_word'] = df['combined_text'].str.contains('|'.join(quality_words)).astype(int)
+    df['has_storage'] = df['combined_text'].str.contains(r'\d+(?:gb|tb)').astype(int)
+    return df
+
+
+def legacy_prepare(processor, df):
+    """The former DataProcessor.prepare_training_data"""
+    df = legacy_extract_features(df)
+    X_text = processor.text_features_matrix(df['combined_text'])
+    X_brand = LabelEncoder().fit_transform(df['brand']).reshape(-1, 1)
+    numerical_cols = ['text_length', 'word_count', 'title_length', 'has_quality_word', 'has_storage']
+    X_numerical = df[numerical_cols].values
+    return X_text, X_brand, X_numerical, df
+
+
+def legacy(processor, df):
+    X_text, X_brand, X_numerical, _ = legacy_prepare(processor, df.copy())
+    return hstack([X_text, X_brand, X_numerical]).tocsr()
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak, seconds
+
+
+def check_serving_layout(processor, df, X):
+    predictor = SmartPricePredictor()
+    bundle = ModelBundle(text_vectorizer=processor.tfidf_vectorizer, brand_vocabulary=processor.brand_vocabulary)
+    sample = df.iloc[:500]
+    features = [predictor.extract_features(t, d) for t, d in zip(sample['title'], sample['description'])]
+    served = predictor._feature_matrix(features, bundle)
+    if served.shape[1] != X.shape[1] or abs(served - X[:500].astype(np.float64)).max() > 1e-6:
+        raise SystemExit("❌ Training matrix does not match the serving feature layout")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    df = load_frame(rows)
+
+    processor = DataProcessor()
+    processor.build_training_matrix(df.iloc[:10_000])
+
+    print(f"{rows:,} rows")
+    print(f"{'method':>16s}{'peak':>11s}{'matrix':>11s}{'time':>9s}{'columns':>9s}")
+    for name, fn in (('prepare+hstack', legacy), ('build', DataProcessor.build_training_matrix)):
+        X, peak, seconds = measure(fn, processor, df)
+        size = X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+        print(f"{name:>16s}{peak / 2**20:9.1f}MB{size / 2**20:9.1f}MB{seconds:8.2f}s{X.shape[1]:9d}")
+    check_serving_layout(processor, df, X)
+
+
+if __name__ == "__main__":
+    main()
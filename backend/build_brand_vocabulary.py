@@ -0,0 +1,36 @@
+"""
+Build a versioned brand vocabulary artifact
+
+Usage:
+    python build_brand_vocabulary.py <brands.txt|brand_encoder.pkl> [output.json]
+
+A .txt source holds one brand per line in detection priority order; a .pkl
+source is a fitted LabelEncoder whose classes are adopted as-is.
+"""
+import sys
+from pathlib import Path
+
+from config.settings import ML_CONFIG, MODEL_DIR
+from core.brand_vocabulary import BrandVocabulary
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print(__doc__)
+        sys.exit(1)
+
+    source = Path(sys.argv[1])
+    output = Path(sys.argv[2]) if len(sys.argv) == 3 else MODEL_DIR / ML_CONFIG['brand_vocabulary_file']
+
+    if source.suffix == '.pkl':
+        vocabulary = BrandVocabulary.from_label_encoder(source)
+    else:
+        with open(source) as f:
+            vocabulary = BrandVocabulary(f.read().splitlines(), source=str(source))
+
+    vocabulary.save(output)
+    print(f"✅ Wrote {len(vocabulary):,} brands (version {vocabulary.version}) to {output}")
+
+
+if __name__ == "__main__":
+    main()
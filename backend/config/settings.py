@@ -20,18 +20,61 @@ LOG_LEVEL = os.getenv("LOG_LEVEL", "info")
 
 # Model Configuration
 MODEL_DIR = BASE_DIR / "models"
+# One sub-directory per model version, each holding the same files as MODEL_DIR
+MODEL_VERSIONS_DIR = Path(os.getenv("MODEL_VERSIONS_DIR", MODEL_DIR / "versions"))
 DATA_DIR = BASE_DIR / "data"
 
 # CORS Configuration
 CORS_ORIGINS = ["*"]  # Allow all origins for development
 
+# Admin endpoints (model reload) need this token in the X-Admin-Token header;
+# without it they only accept requests from the loopback interface
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN") or None
+
 # ML Model Settings
 ML_CONFIG = {
     "model_file": "lgbm_final_model.pkl",
     "vectorizer_file": "tfidf_vectorizer.pkl", 
     "brand_encoder_file": "brand_encoder.pkl",
+    "brand_vocabulary_file": "brand_vocabulary.json",
+    # "vocabulary" (fitted TfidfVectorizer) or "hashing" (fixed-width hashed TF-IDF)
+    "text_features": os.getenv("TEXT_FEATURES", "vocabulary"),
+    "hashed_vectorizer_file": "hashed_tfidf.json",
+    # Version directory to serve at startup; unset serves the files in MODEL_DIR
+    "model_version": os.getenv("MODEL_VERSION") or None,
+    # "booster" (native LightGBM Booster, fixed threads) or "sklearn" (estimator.predict)
+    "inference_backend": os.getenv("MODEL_BACKEND", "booster"),
+    "inference_threads": int(os.getenv("MODEL_NUM_THREADS", 1)),
     "max_features": 10000,
-    "confidence_threshold": 0.7
+    "confidence_threshold": 0.7,
+    "max_batch_size": int(os.getenv("MAX_BATCH_SIZE", 10000))
+}
+
+# Prediction Cache Settings
+CACHE_CONFIG = {
+    # "memory" (per process) or "sqlite" (shared by all workers on the host)
+    "backend": os.getenv("PREDICTION_CACHE_BACKEND", "memory"),
+    "path": os.getenv("PREDICTION_CACHE_PATH"),
+    "max_entries": int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", 10000)),
+    "max_bytes": int(os.getenv("PREDICTION_CACHE_MAX_BYTES", 32 * 1024 * 1024)),
+    "ttl_seconds": float(os.getenv("PREDICTION_CACHE_TTL", 0)) or None
+}
+
+# Inference Worker Pool
+INFERENCE_CONFIG = {
+    # "thread" shares the loaded models; "process" loads a copy per worker
+    "executor": os.getenv("INFERENCE_EXECUTOR", "thread"),
+    "max_workers": int(os.getenv("INFERENCE_WORKERS", 0)) or None,
+    "max_queue": int(os.getenv("INFERENCE_MAX_QUEUE", 64)),
+    "retry_after_seconds": int(os.getenv("INFERENCE_RETRY_AFTER", 1))
+}
+
+# Micro-batching of concurrent /predict calls
+BATCHING_CONFIG = {
+    "enabled": os.getenv("MICRO_BATCHING", "true").lower() == "true",
+    "max_batch_size": int(os.getenv("MICRO_BATCH_MAX_SIZE", 32)),
+    "max_wait_ms": float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", 5)),
+    "max_queue": int(os.getenv("MICRO_BATCH_MAX_QUEUE", 1024))
 }
 
 # Logging Configuration
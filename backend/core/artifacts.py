@@ -0,0 +1,122 @@
+"""
+Process-wide registry of loaded model artifacts
+"""
+import logging
+import os
+import pickle
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def resident_memory_bytes() -> Optional[int]:
+    """Current resident set size, or None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def load_pickle(path: Path) -> Any:
+    """Unpickle a file (sklearn vectorizers and encoders)"""
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+class ArtifactRecord:
+    """A loaded artifact and what it cost to load"""
+
+    __slots__ = ('name', 'path', 'fingerprint', 'value', 'load_seconds', 'rss_delta_bytes', 'size_bytes', 'loaded_at')
+
+    def __init__(self, name, path, fingerprint, value, load_seconds, rss_delta_bytes, size_bytes):
+        self.name = name
+        self.path = path
+        self.fingerprint = fingerprint
+        self.value = value
+        self.load_seconds = load_seconds
+        self.rss_delta_bytes = rss_delta_bytes
+        self.size_bytes = size_bytes
+        self.loaded_at = datetime.now()
+
+    def to_dict(self) -> Dict:
+        return {
+            'path': str(self.path) if self.path else None,
+            'size_bytes': self.size_bytes,
+            'load_seconds': round(self.load_seconds, 4),
+            'rss_delta_bytes': self.rss_delta_bytes,
+            'loaded_at': self.loaded_at.isoformat()
+        }
+
+
+class ArtifactRegistry:
+    """Loads each artifact once and hands out shared references.
+
+    Entries are keyed by name and the source file's path, size and mtime,
+    so asking again for an unchanged file returns the object already in
+    memory while a replaced file is loaded afresh. Objects are shared
+    between components and must be treated as read-only.
+
+    RSS deltas are measured around each load; other threads allocating at
+    the same time can skew them, so they are indicative rather than exact.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, ArtifactRecord] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _fingerprint(path: Optional[Path]):
+        if path is None:
+            return None
+        stat = Path(path).stat()
+        return (str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+
+    def load(self, name: str, path: Optional[Path], loader: Callable[[], Any]) -> Any:
+        """Return the artifact `name` from `path`, loading it with `loader` only once"""
+        fingerprint = self._fingerprint(path)
+        with self._lock:
+            record = self._records.get(name)
+            if record is not None and record.fingerprint == fingerprint:
+                return record.value
+
+            rss_before = resident_memory_bytes()
+            start = time.perf_counter()
+            value = loader()
+            load_seconds = time.perf_counter() - start
+            rss_after = resident_memory_bytes()
+
+            self._records[name] = ArtifactRecord(
+                name=name,
+                path=path,
+                fingerprint=fingerprint,
+                value=value,
+                load_seconds=load_seconds,
+                rss_delta_bytes=rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+                size_bytes=fingerprint[1] if fingerprint else None
+            )
+            logger.info(f"📦 Artifact '{name}' loaded in {load_seconds:.3f}s")
+            return value
+
+    def get(self, name: str) -> Any:
+        """An already loaded artifact, or None"""
+        with self._lock:
+            record = self._records.get(name)
+            return record.value if record else None
+
+    def evict(self, name: str):
+        with self._lock:
+            self._records.pop(name, None)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Load time, memory and size per artifact"""
+        with self._lock:
+            return {name: record.to_dict() for name, record in self._records.items()}
+
+
+# Global registry
+artifact_registry = ArtifactRegistry()
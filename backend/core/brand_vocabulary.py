@@ -0,0 +1,137 @@
+"""
+Versioned brand vocabulary with dictionary encoding
+"""
+import hashlib
+import json
+import logging
+import pickle
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from core.keywords import PRODUCT_BRANDS, KeywordMatcher
+from core.text_normalization import normalize_text
+
+logger = logging.getLogger(__name__)
+
+VOCABULARY_FORMAT_VERSION = 1
+UNKNOWN_BRAND = 'unknown'
+
+
+def normalize_brand(brand: str) -> str:
+    """Normalize a brand name the way product text is preprocessed"""
+    return normalize_text(str(brand))
+
+
+class BrandVocabulary:
+    """Brand list used for detection and encoding.
+
+    Codes are positions in the sorted class list, exactly as a fitted
+    sklearn LabelEncoder assigns them, so models trained on encoder output
+    keep working. Encoding is a dict lookup, and brands outside the
+    vocabulary map to the 'unknown' code. Detection prefers brands earlier
+    in the source list.
+
+    A vocabulary adopted from an encoder keeps its classes_ verbatim: each
+    class keeps its encoder index, and its normalized spelling (what
+    detection returns) is an alias for that index.
+    """
+
+    def __init__(self, brands: Iterable[str], version: Optional[str] = None, source: str = 'builtin',
+                 classes: Optional[Iterable[str]] = None):
+        normalized = (normalize_brand(b) for b in brands)
+        self.brands: List[str] = [b for b in dict.fromkeys(normalized) if b and b != UNKNOWN_BRAND]
+        if classes is None:
+            self.fixed_classes = False
+            self.classes_ = np.array(sorted(self.brands + [UNKNOWN_BRAND]))
+        else:
+            self.fixed_classes = True
+            self.classes_ = np.array([str(c) for c in classes])
+        self.codes = {brand: code for code, brand in enumerate(self.classes_.tolist())}
+        if self.fixed_classes:
+            # First class wins when several normalize to the same spelling
+            for code, brand in enumerate(self.classes_.tolist()):
+                self.codes.setdefault(normalize_brand(brand), code)
+        # An encoder without an 'unknown' class gets one past its last index
+        self.unknown_code = self.codes.setdefault(UNKNOWN_BRAND, len(self.classes_))
+        self.version = version or self._content_version(self.classes_.tolist() if self.fixed_classes else self.brands)
+        self.source = source
+        self.matcher = KeywordMatcher(self.brands)
+
+    @staticmethod
+    def _content_version(brands: List[str]) -> str:
+        return hashlib.blake2b('\n'.join(brands).encode('utf-8'), digest_size=6).hexdigest()
+
+    @classmethod
+    def default(cls) -> 'BrandVocabulary':
+        return cls(PRODUCT_BRANDS, source='builtin')
+
+    @classmethod
+    def from_file(cls, path: Path) -> 'BrandVocabulary':
+        """Load a JSON artifact: {"format_version", "version", "brands"[, "classes"]}"""
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('format_version') != VOCABULARY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported brand vocabulary format: {data.get('format_version')}")
+        return cls(data['brands'], version=data.get('version'), source=str(path), classes=data.get('classes'))
+
+    @classmethod
+    def from_label_encoder(cls, path: Path) -> 'BrandVocabulary':
+        """Adopt the classes of a pickled LabelEncoder, keeping its codes"""
+        with open(path, 'rb') as f:
+            encoder = pickle.load(f)
+        classes = encoder.classes_.tolist()
+        return cls(classes, source=str(path), classes=classes)
+
+    @classmethod
+    def load(cls, model_dir: Path, vocabulary_file: str, encoder_file: str) -> 'BrandVocabulary':
+        """Vocabulary artifact, else the pickled encoder, else the built-in brands"""
+        for filename, loader in ((vocabulary_file, cls.from_file), (encoder_file, cls.from_label_encoder)):
+            path = Path(model_dir) / filename
+            if not path.exists():
+                continue
+            try:
+                vocabulary = loader(path)
+                logger.info(f"✅ Brand vocabulary {vocabulary.version} loaded from {path} ({len(vocabulary):,} brands)")
+                return vocabulary
+            except Exception as e:
+                logger.warning(f"⚠️ Ignoring unreadable brand vocabulary {path}: {e}")
+
+        logger.info("✅ Using built-in brand vocabulary")
+        return cls.default()
+
+    def save(self, path: Path):
+        data = {
+            'format_version': VOCABULARY_FORMAT_VERSION,
+            'version': self.version,
+            'brands': self.brands
+        }
+        if self.fixed_classes:
+            data['classes'] = self.classes_.tolist()
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=1)
+
+    def __len__(self):
+        return len(self.brands)
+
+    def __contains__(self, brand: str) -> bool:
+        return brand in self.codes and brand != UNKNOWN_BRAND
+
+    def detect(self, text: str) -> str:
+        """Highest-priority brand mentioned in preprocessed text"""
+        return self.matcher.best(text) or UNKNOWN_BRAND
+
+    def encode(self, brand: str) -> int:
+        return self.codes.get(brand, self.unknown_code)
+
+    def encode_batch(self, brands: Iterable[str]) -> np.ndarray:
+        """Codes for many brands; unknown brands get the 'unknown' code"""
+        lookup = self.codes.get
+        unknown = self.unknown_code
+        return np.fromiter((lookup(b, unknown) for b in brands), dtype=np.int64)
+
+    def transform(self, brands: Iterable[str]) -> np.ndarray:
+        """LabelEncoder-compatible alias of encode_batch"""
+        return self.encode_batch(brands)
+
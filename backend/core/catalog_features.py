@@ -0,0 +1,127 @@
+"""
+Columnar feature extraction for catalog analytics
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from core.keywords import KeywordMatcher
+
+# Keyword lists used for catalog analytics
+CATALOG_BRANDS = ['amazon', 'walmart', 'target', 'organic', 'premium', 'gourmet', 'natural']
+CATALOG_QUALITY_WORDS = ['organic', 'premium', 'gourmet', 'natural', 'fresh', 'artisan', 'handcrafted']
+
+catalog_brand_matcher = KeywordMatcher(CATALOG_BRANDS)
+catalog_quality_matcher = KeywordMatcher(CATALOG_QUALITY_WORDS)
+
+# Both lists are found in one scan; these flags say which list each keyword belongs to
+_catalog_keywords = KeywordMatcher(CATALOG_BRANDS + CATALOG_QUALITY_WORDS)
+_IS_BRAND = np.array([k in catalog_brand_matcher for k in _catalog_keywords.keywords], dtype=np.int64)
+_IS_QUALITY = np.array([k in catalog_quality_matcher for k in _catalog_keywords.keywords], dtype=np.int64)
+
+# Price and size/quantity mentions
+PRICE_PATTERN = r'\$?\d+\.?\d*\s*(?:oz|ounce|lb|pound|fl\s*oz|count|pack)'
+SIZE_PATTERN = r'\d+\.?\d*\s*(?:oz|ounce|lb|pound|fl\s*oz|count|pack|ct)'
+
+FEATURE_COLUMNS = ['brand_count', 'quality_score', 'text_length', 'word_count', 'has_size', 'price_mentions']
+
+# Row separator for the joined text blob; none of the patterns can match across it
+_SEPARATOR = '\x00'
+
+_PRICE_RE = re.compile(PRICE_PATTERN)
+_SIZE_RE = re.compile(SIZE_PATTERN)
+_CT_RE = re.compile('ct')
+
+# ASCII characters treated as whitespace by str.split()
+_ASCII_SPACE = np.zeros(256, dtype=bool)
+_ASCII_SPACE[[9, 10, 11, 12, 13, 28, 29, 30, 31, 32]] = True
+
+
+class _TextBlob:
+    """All texts of a column joined into one string with row offsets"""
+
+    def __init__(self, values, lengths):
+        self.text = _SEPARATOR.join(values)
+        self.starts = np.zeros(len(values), dtype=np.int64)
+        np.cumsum(lengths[:-1] + 1, out=self.starts[1:])
+
+    def rows_of(self, regex):
+        """Row index of every non-overlapping match of regex"""
+        positions = np.fromiter((m.start() for m in regex.finditer(self.text)), dtype=np.int64)
+        return np.searchsorted(self.starts, positions, side='right') - 1
+
+    def keyword_hits(self, matcher):
+        """(row, keyword id) of every distinct keyword found in each row"""
+        # Separators are matched as well, so a keyword's row is the number of
+        # separators before it; findall stays in C and returns plain strings
+        tokens = re.findall(f"{_SEPARATOR}|{matcher.pattern}", self.text)
+        codes = np.fromiter(map({_SEPARATOR: -1, **matcher.ids}.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        is_separator = codes < 0
+        rows = np.cumsum(is_separator)[~is_separator]
+        pairs = np.unique(rows * len(matcher) + codes[~is_separator])
+        return pairs // len(matcher), pairs % len(matcher)
+
+
+def _word_counts(values, lengths):
+    """Equivalent of len(text.split()) for every text"""
+    n = len(values)
+    is_ascii = np.fromiter((v.isascii() for v in values), dtype=bool, count=n)
+    ascii_lengths = np.where(is_ascii, lengths, 0)
+
+    raw = np.frombuffer(
+        ' '.join(v if ok else '' for v, ok in zip(values, is_ascii)).encode('ascii'), dtype=np.uint8
+    )
+    space = _ASCII_SPACE[raw]
+    word_start = ~space
+    word_start[1:] &= space[:-1]
+
+    starts = np.zeros(n, dtype=np.int64)
+    np.cumsum(ascii_lengths[:-1] + 1, out=starts[1:])
+    rows = np.searchsorted(starts, np.flatnonzero(word_start), side='right') - 1
+    counts = np.bincount(rows, minlength=n)
+
+    for i in np.flatnonzero(~is_ascii):
+        counts[i] = len(values[i].split())
+    return counts
+
+
+def extract_catalog_features(texts: pd.Series) -> pd.DataFrame:
+    """Extract catalog features for a whole column at once.
+
+    Produces the same values as extracting row by row: missing or empty
+    texts yield NaN features, everything else is lowercased and scanned
+    once per pattern over the joined column instead of once per row.
+    """
+    n = len(texts)
+    valid = texts.notna() & (texts.astype(str) != '')
+    values = texts.where(valid, '').astype(str).str.lower().tolist()
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=n)
+
+    blob = _TextBlob([v.replace(_SEPARATOR, ' ') for v in values], lengths)
+
+    rows, ids = blob.keyword_hits(_catalog_keywords)
+    brand_count = np.bincount(rows, weights=_IS_BRAND[ids], minlength=n).astype(np.int64)
+    quality_score = np.bincount(rows, weights=_IS_QUALITY[ids], minlength=n).astype(np.int64)
+
+    # Every price mention is also a size mention, so the size pattern only
+    # needs to run on the remaining rows that could match its extra 'ct' unit
+    price_mentions = np.bincount(blob.rows_of(_PRICE_RE), minlength=n)
+    has_size = price_mentions > 0
+    for i in np.unique(blob.rows_of(_CT_RE)):
+        if not has_size[i]:
+            has_size[i] = _SIZE_RE.search(values[i]) is not None
+
+    features = pd.DataFrame({
+        'brand_count': brand_count,
+        'quality_score': quality_score,
+        'text_length': lengths,
+        'word_count': _word_counts(values, lengths),
+        'has_size': has_size,
+        'price_mentions': price_mentions
+    }, index=texts.index)
+
+    if not valid.all():
+        features = features.where(valid, axis=0)
+
+    return features
@@ -0,0 +1,194 @@
+"""
+Inference-only TF-IDF vectorizer built from a fitted sklearn TfidfVectorizer
+"""
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.preprocessing import normalize
+
+
+def _strip_accents_unicode(text: str) -> str:
+    normalized = unicodedata.normalize('NFKD', text)
+    if normalized == text:
+        return text
+    return ''.join(c for c in normalized if not unicodedata.combining(c))
+
+
+def _strip_accents_ascii(text: str) -> str:
+    return unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('ASCII')
+
+
+_ACCENT_STRIPPERS = {None: None, 'unicode': _strip_accents_unicode, 'ascii': _strip_accents_ascii}
+
+
+class FastTfidfVectorizer:
+    """Transforms text exactly like a fitted word-analyzer TfidfVectorizer.
+
+    Only the pieces needed at inference are kept: the compiled token regex,
+    the vocabulary as a plain dict of Python ints, and the idf weights.
+    Tokens and n-grams are looked up as they are produced, and rows are
+    written straight into CSR arrays without sklearn's input validation.
+    Output matches sklearn: same sorted indices, and the same values because
+    the l2 norm is accumulated in the same order as sklearn's row kernel.
+    """
+
+    def __init__(self, vocabulary: Dict[str, int], idf: np.ndarray, token_pattern: str,
+                 ngram_range=(1, 1), lowercase: bool = True, strip_accents=None, stop_words=None,
+                 norm='l2', sublinear_tf: bool = False, binary: bool = False):
+        if norm not in (None, 'l1', 'l2'):
+            raise ValueError(f"Unsupported norm: {norm}")
+        if strip_accents not in _ACCENT_STRIPPERS:
+            raise ValueError(f"Unsupported strip_accents: {strip_accents}")
+
+        self.vocabulary = {term: int(index) for term, index in vocabulary.items()}
+        self.idf = None if idf is None else np.asarray(idf, dtype=np.float64)
+        self._idf_list = None if idf is None else self.idf.tolist()
+        self.token_regex = re.compile(token_pattern)
+        if self.token_regex.groups > 1:
+            raise ValueError("token_pattern may contain at most one capturing group")
+        self.min_n, self.max_n = ngram_range
+        self.lowercase = lowercase
+        self.strip_accents = _ACCENT_STRIPPERS[strip_accents]
+        self.stop_words = frozenset(stop_words) if stop_words else None
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+        self.binary = binary
+        self.n_features = len(self.vocabulary)
+
+    @classmethod
+    def from_sklearn(cls, vectorizer) -> 'FastTfidfVectorizer':
+        """Build from a fitted TfidfVectorizer; raises ValueError for unsupported setups"""
+        if vectorizer.analyzer != 'word' or vectorizer.tokenizer is not None or vectorizer.preprocessor is not None:
+            raise ValueError("Only the built-in word analyzer is supported")
+        if vectorizer.input != 'content':
+            raise ValueError("Only input='content' is supported")
+        if np.dtype(vectorizer.dtype) != np.float64:
+            raise ValueError("Only float64 output is supported")
+        if vectorizer.strip_accents is not None and not isinstance(vectorizer.strip_accents, str):
+            raise ValueError("Callable strip_accents is not supported")
+
+        return cls(
+            vocabulary=vectorizer.vocabulary_,
+            idf=vectorizer.idf_ if vectorizer.use_idf else None,
+            token_pattern=vectorizer.token_pattern,
+            ngram_range=vectorizer.ngram_range,
+            lowercase=vectorizer.lowercase,
+            strip_accents=vectorizer.strip_accents,
+            stop_words=vectorizer.get_stop_words(),
+            norm=vectorizer.norm,
+            sublinear_tf=vectorizer.sublinear_tf,
+            binary=vectorizer.binary
+        )
+
+    def _tokens(self, doc: str) -> List[str]:
+        if self.lowercase:
+            doc = doc.lower()
+        if self.strip_accents is not None:
+            doc = self.strip_accents(doc)
+        tokens = self.token_regex.findall(doc)
+        if self.stop_words is not None:
+            tokens = [t for t in tokens if t not in self.stop_words]
+        return tokens
+
+    def _counts(self, doc: str) -> Counter:
+        """Vocabulary index -> count for every in-vocabulary n-gram of doc"""
+        tokens = self._tokens(doc)
+        lookup = self.vocabulary.get
+        counts = Counter()
+        n_tokens = len(tokens)
+
+        if self.min_n == 1:
+            counts.update(index for index in map(lookup, tokens) if index is not None)
+        join = ' '.join
+        for n in range(max(2, self.min_n), min(self.max_n, n_tokens) + 1):
+            for i in range(n_tokens - n + 1):
+                index = lookup(join(tokens[i:i + n]))
+                if index is not None:
+                    counts[index] += 1
+        return counts
+
+    def _weights(self, counts: Counter):
+        """Sorted indices and tf-idf values of one row, before normalization"""
+        indices = sorted(counts)
+        if self.binary:
+            tf = [1.0] * len(indices)
+        elif self.sublinear_tf:
+            tf = [math.log(counts[i]) + 1.0 for i in indices]
+        else:
+            tf = [float(counts[i]) for i in indices]
+        if self._idf_list is not None:
+            idf = self._idf_list
+            tf = [value * idf[i] for value, i in zip(tf, indices)]
+        return indices, tf
+
+    def _normalize_row(self, values: List[float]) -> List[float]:
+        """Row normalization in the same accumulation order as sklearn's kernel"""
+        if self.norm is None:
+            return values
+        total = 0.0
+        if self.norm == 'l2':
+            for value in values:
+                total += value * value
+            total = math.sqrt(total)
+        else:
+            for value in values:
+                total += abs(value)
+        if total == 0.0:
+            return values
+        return [value / total for value in values]
+
+    def row(self, doc: str) -> Tuple[List[int], List[float]]:
+        """Sorted column indices and final values of a single document"""
+        indices, values = self._weights(self._counts(doc))
+        return indices, self._normalize_row(values)
+
+    def transform_one(self, doc: str) -> csr_matrix:
+        """Vectorize a single document"""
+        indices, values = self.row(doc)
+        return csr_matrix(
+            (np.array(values, dtype=np.float64), np.array(indices, dtype=np.int32),
+             np.array([0, len(indices)], dtype=np.int32)),
+            shape=(1, self.n_features)
+        )
+
+    def transform_batch(self, docs: Iterable[str]) -> csr_matrix:
+        """Vectorize many documents; weighting and normalization run vectorized"""
+        indices: List[int] = []
+        counts: List[int] = []
+        indptr = [0]
+        for doc in docs:
+            row = self._counts(doc)
+            for index in sorted(row):
+                indices.append(index)
+                counts.append(row[index])
+            indptr.append(len(indices))
+
+        index_array = np.array(indices, dtype=np.int32)
+        data = np.array(counts, dtype=np.float64)
+        if self.binary:
+            data[:] = 1.0
+        elif self.sublinear_tf:
+            np.log(data, out=data)
+            data += 1.0
+        if self.idf is not None:
+            data *= self.idf[index_array]
+
+        X = csr_matrix((data, index_array, np.array(indptr, dtype=np.int32)),
+                       shape=(len(indptr) - 1, self.n_features))
+        if self.norm is not None:
+            X = normalize(X, norm=self.norm, copy=False)
+        return X
+
+    def transform(self, docs) -> csr_matrix:
+        """Drop-in for TfidfVectorizer.transform"""
+        if isinstance(docs, str):
+            raise ValueError("Iterable over raw text documents expected, string object received.")
+        docs = list(docs)
+        if len(docs) == 1:
+            return self.transform_one(docs[0])
+        return self.transform_batch(docs)
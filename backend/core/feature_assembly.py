@@ -0,0 +1,99 @@
+"""
+Model input assembly straight into CSR arrays
+"""
+import threading
+from typing import Sequence
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+# Model input layout shared by training and serving: text features, then these columns
+NUMERIC_COLUMNS = ('text_len', 'word_count', 'brand_code', 'has_quality')
+
+
+class FeatureAssembler:
+    """Writes TF-IDF columns and the numeric tail straight into CSR arrays.
+
+    Replaces hstack([text, csr_matrix(numeric)]): no dense tail matrix, no
+    COO round trip and no intermediate blocks. Rows come out exactly as
+    hstack builds them (sorted indices, zero tail values left out).
+
+    Single rows reuse one CSR matrix and its buffers per thread; the
+    returned matrix is only valid until that thread assembles the next row.
+    Batches are written into arrays allocated once at their final size.
+    """
+
+    def __init__(self, n_text_features: int, n_tail: int):
+        self.n_text_features = n_text_features
+        self.n_tail = n_tail
+        self.n_features = n_text_features + n_tail
+        self._tail_columns = np.arange(n_text_features, self.n_features, dtype=np.int32)
+        self._tail_column_list = self._tail_columns.tolist()
+        self._local = threading.local()
+
+    @classmethod
+    def for_vectorizer(cls, text_vectorizer) -> 'FeatureAssembler':
+        """Assembler for the shared layout: the vectorizer's columns, then NUMERIC_COLUMNS"""
+        text_width = getattr(text_vectorizer, 'n_features', None) or len(text_vectorizer.vocabulary_)
+        return cls(text_width, len(NUMERIC_COLUMNS))
+
+    def _row_buffers(self, nnz: int):
+        """This thread's (matrix, data, indices, indptr), with room for nnz values"""
+        local = self._local
+        data = getattr(local, 'data', None)
+        if data is None or data.shape[0] < nnz:
+            size = max(256, 1 << (nnz - 1).bit_length())
+            local.data = data = np.zeros(size, dtype=np.float64)
+            local.indices = np.zeros(size, dtype=np.int32)
+            local.indptr = np.zeros(2, dtype=np.int32)
+            local.matrix = csr_matrix((1, self.n_features), dtype=np.float64)
+        return local.matrix, data, local.indices, local.indptr
+
+    def row(self, text_indices: Sequence[int], text_values: Sequence[float], tail: Sequence[float]) -> csr_matrix:
+        """One row from the text vector's sorted indices/values and the tail values"""
+        n_text = len(text_indices)
+        matrix, data, indices, indptr = self._row_buffers(n_text + self.n_tail)
+
+        data[:n_text] = text_values
+        indices[:n_text] = text_indices
+        nnz = n_text
+        for column, value in zip(self._tail_column_list, tail):
+            if value != 0:
+                data[nnz] = value
+                indices[nnz] = column
+                nnz += 1
+        indptr[1] = nnz
+
+        # Views are assigned directly: the constructor would copy slices of a larger buffer
+        matrix.data = data[:nnz]
+        matrix.indices = indices[:nnz]
+        matrix.indptr = indptr
+        return matrix
+
+    def rows(self, text: csr_matrix, tail: np.ndarray, dtype=np.float64) -> csr_matrix:
+        """Rows from a CSR text matrix and an (n_rows, n_tail) tail array, with values of dtype"""
+        text = text.tocsr()
+        n_rows = text.shape[0]
+        tail_mask = tail != 0
+        tail_rows, tail_slots = np.nonzero(tail_mask)
+        nnz = text.nnz + len(tail_rows)
+
+        indptr = np.empty(n_rows + 1, dtype=np.int32)
+        indptr[0] = 0
+        np.cumsum(np.diff(text.indptr) + tail_mask.sum(axis=1), out=indptr[1:])
+
+        # The k-th tail value (row-major) lands after the text values up to its row and k earlier tail values
+        tail_positions = text.indptr[tail_rows + 1] + np.arange(len(tail_rows))
+        is_text = np.ones(nnz, dtype=bool)
+        is_text[tail_positions] = False
+
+        data = np.empty(nnz, dtype=dtype)
+        indices = np.empty(nnz, dtype=np.int32)
+        data[is_text] = text.data
+        indices[is_text] = text.indices
+        data[tail_positions] = tail[tail_rows, tail_slots]
+        indices[tail_positions] = self._tail_columns[tail_slots]
+
+        matrix = csr_matrix((data, indices, indptr), shape=(n_rows, self.n_features), copy=False)
+        matrix.has_sorted_indices = True
+        return matrix
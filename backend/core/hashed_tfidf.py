@@ -0,0 +1,136 @@
+"""
+Vocabulary-free TF-IDF based on feature hashing
+"""
+import json
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+HASHED_FORMAT_VERSION = 1
+
+
+class HashedTfidfVectorizer:
+    """TF-IDF over a fixed-width hashed feature space.
+
+    Terms are hashed into `n_features` columns, so there is no vocabulary
+    dict; the only fitted state is one idf weight per column. Saved
+    artifacts keep the weights in a separate .npy file that is memory-mapped
+    on load, so workers share one page-cached copy and load time does not
+    depend on how many distinct terms the training corpus had.
+    """
+
+    def __init__(self, n_features: int = 2 ** 18, ngram_range=(1, 2), token_pattern: str = r"(?u)\b\w\w+\b",
+                 lowercase: bool = True, stop_words=None, norm: Optional[str] = 'l2',
+                 smooth_idf: bool = True, sublinear_tf: bool = False):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self.stop_words = stop_words
+        self.norm = norm
+        self.smooth_idf = smooth_idf
+        self.sublinear_tf = sublinear_tf
+        self.idf_ = None
+        self.n_documents_ = 0
+        self.artifact_paths = []
+        self._hasher = HashingVectorizer(
+            n_features=n_features, ngram_range=self.ngram_range, token_pattern=token_pattern,
+            lowercase=lowercase, stop_words=stop_words, alternate_sign=False, norm=None
+        )
+
+    def _counts(self, docs: Iterable[str]) -> csr_matrix:
+        return self._hasher.transform(docs)
+
+    def fit(self, docs: Iterable[str]) -> 'HashedTfidfVectorizer':
+        self._fit_counts(self._counts(docs))
+        return self
+
+    def fit_chunks(self, chunks: Iterable[Iterable[str]]) -> 'HashedTfidfVectorizer':
+        """fit over chunks of documents, holding only one chunk's counts at a time"""
+        document_frequency = np.zeros(self.n_features, dtype=np.int64)
+        n_documents = 0
+        for docs in chunks:
+            counts = self._counts(docs)
+            document_frequency += np.bincount(counts.indices, minlength=self.n_features)
+            n_documents += counts.shape[0]
+        self._fit_frequencies(document_frequency, n_documents)
+        return self
+
+    def _fit_counts(self, counts: csr_matrix):
+        self._fit_frequencies(np.bincount(counts.indices, minlength=self.n_features), counts.shape[0])
+
+    def _fit_frequencies(self, document_frequency: np.ndarray, n_documents: int):
+        smooth = int(self.smooth_idf)
+        self.idf_ = (np.log((n_documents + smooth) / (document_frequency + smooth)) + 1).astype(np.float32)
+        self.n_documents_ = n_documents
+
+    def _weight(self, counts: csr_matrix) -> csr_matrix:
+        X = counts.astype(np.float64)
+        if self.sublinear_tf:
+            np.log(X.data, out=X.data)
+            X.data += 1.0
+        X.data *= self.idf_[X.indices]
+        if self.norm is not None:
+            X = normalize(X, norm=self.norm, copy=False)
+        return X
+
+    def transform(self, docs: Iterable[str]) -> csr_matrix:
+        if self.idf_ is None:
+            raise ValueError("HashedTfidfVectorizer is not fitted")
+        return self._weight(self._counts(docs))
+
+    def fit_transform(self, docs: Iterable[str]) -> csr_matrix:
+        counts = self._counts(docs)
+        self._fit_counts(counts)
+        return self._weight(counts)
+
+    def save(self, path: Path):
+        """Write the settings as JSON and the idf weights next to it as .npy"""
+        path = Path(path)
+        idf_path = path.with_suffix('.idf.npy')
+        np.save(idf_path, self.idf_)
+        with open(path, 'w') as f:
+            json.dump({
+                'format_version': HASHED_FORMAT_VERSION,
+                'n_features': self.n_features,
+                'ngram_range': list(self.ngram_range),
+                'token_pattern': self.token_pattern,
+                'lowercase': self.lowercase,
+                'stop_words': sorted(self.stop_words) if isinstance(self.stop_words, (list, set, frozenset)) else self.stop_words,
+                'norm': self.norm,
+                'smooth_idf': self.smooth_idf,
+                'sublinear_tf': self.sublinear_tf,
+                'n_documents': self.n_documents_,
+                'idf_file': idf_path.name
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, path: Path) -> 'HashedTfidfVectorizer':
+        """Load an artifact written by save(); idf weights are memory-mapped"""
+        path = Path(path)
+        with open(path) as f:
+            config = json.load(f)
+        if config.get('format_version') != HASHED_FORMAT_VERSION:
+            raise ValueError(f"Unsupported hashed TF-IDF format: {config.get('format_version')}")
+
+        vectorizer = cls(
+            n_features=config['n_features'],
+            ngram_range=config['ngram_range'],
+            token_pattern=config['token_pattern'],
+            lowercase=config['lowercase'],
+            stop_words=config['stop_words'],
+            norm=config['norm'],
+            smooth_idf=config['smooth_idf'],
+            sublinear_tf=config['sublinear_tf']
+        )
+        idf_path = path.parent / config['idf_file']
+        vectorizer.idf_ = np.load(idf_path, mmap_mode='r')
+        vectorizer.n_documents_ = config['n_documents']
+        vectorizer.artifact_paths = [path, idf_path]
+        if vectorizer.idf_.shape != (vectorizer.n_features,):
+            raise ValueError(f"idf weights have shape {vectorizer.idf_.shape}, expected ({vectorizer.n_features},)")
+        return vectorizer
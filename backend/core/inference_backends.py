@@ -0,0 +1,72 @@
+"""
+Model scoring backends: the sklearn wrapper or the native LightGBM Booster
+"""
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SklearnBackend:
+    """Scores through the estimator's own predict(), with its input validation"""
+
+    name = 'sklearn'
+
+    def __init__(self, model):
+        self.model = model
+        self.n_features_in_ = getattr(model, 'n_features_in_', None)
+
+    def predict(self, X) -> np.ndarray:
+        return self.model.predict(X)
+
+    def to_dict(self):
+        return {'backend': self.name}
+
+
+class BoosterBackend:
+    """Scores CSR input directly on the fitted LightGBM Booster.
+
+    Skips the sklearn wrapper's check_array and parameter processing, and
+    runs with a fixed thread count instead of one OpenMP thread per core on
+    every call. The Booster is the one the wrapper itself predicts with, so
+    the output is identical.
+    """
+
+    name = 'booster'
+
+    def __init__(self, model, num_threads: int = 1):
+        import lightgbm as lgb
+
+        booster = model if isinstance(model, lgb.Booster) else getattr(model, 'booster_', None)
+        if not isinstance(booster, lgb.Booster):
+            raise ValueError(f"{type(model).__name__} has no LightGBM Booster")
+        self.booster = booster
+        self.num_threads = num_threads
+        self.n_features_in_ = getattr(model, 'n_features_in_', None) or booster.num_feature()
+
+    def predict(self, X) -> np.ndarray:
+        return self.booster.predict(X, num_threads=self.num_threads)
+
+    def to_dict(self):
+        return {'backend': self.name, 'num_threads': self.num_threads}
+
+
+INFERENCE_BACKENDS = {
+    SklearnBackend.name: SklearnBackend,
+    BoosterBackend.name: BoosterBackend,
+}
+
+
+def create_inference_backend(model, backend: str = 'booster', num_threads: int = 1):
+    """Backend for a loaded model; falls back to sklearn if the request cannot be met"""
+    if backend not in INFERENCE_BACKENDS:
+        logger.warning(f"⚠️ Unknown inference backend '{backend}', using sklearn")
+        return SklearnBackend(model)
+    if backend == BoosterBackend.name:
+        try:
+            return BoosterBackend(model, num_threads=num_threads)
+        except (ImportError, ValueError) as e:
+            logger.warning(f"⚠️ Booster backend unavailable ({e}), using sklearn")
+            return SklearnBackend(model)
+    return SklearnBackend(model)
@@ -0,0 +1,97 @@
+"""
+Shared keyword dictionaries and a compiled word-boundary matcher
+"""
+import re
+from typing import Iterable, List, Optional, Set
+
+# Brands recognised by the price predictor, in priority order
+PRODUCT_BRANDS = ['apple', 'samsung', 'sony', 'nike', 'adidas', 'lg', 'hp', 'dell', 'lenovo', 'asus']
+
+# Words that mark a premium product
+QUALITY_WORDS = ['premium', 'luxury', 'professional', 'pro', 'ultra', 'max']
+
+# Heuristic pricing keywords
+STORAGE_WORDS = ['1tb', '512gb', '256gb']
+PHONE_WORDS = ['smartphone', 'smartphones', 'phone', 'phones', 'iphone']
+COMPUTER_WORDS = ['laptop', 'laptops', 'computer', 'computers', 'notebook']
+
+# Keywords only match as whole words: 'hp' does not match inside "php"
+_WORD_START = r'(?<!\w)'
+_WORD_END = r'(?!\w)'
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex alternation shaped like a prefix trie of the keywords.
+
+    Shared prefixes are factored out ('pro' and 'professional' become
+    'pro(?:fessional)?'), so the engine tries at most one branch per
+    character and the cost of a scan barely grows with the keyword count.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = None
+
+    def emit(node) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and '' not in node:
+            return branches[0]
+        group = f"(?:{'|'.join(branches)})"
+        # Greedy optional: longer keywords are tried before their prefixes
+        return group + '?' if '' in node else group
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    """Whole-word matching of a keyword list compiled into one regex.
+
+    Texts are expected to be lowercase already, as every caller normalises
+    them first. Keywords keep their list order as a priority for `best`.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(dict.fromkeys(k.lower() for k in keywords if k))
+        self.ids = {keyword: i for i, keyword in enumerate(self.keywords)}
+        # Non-capturing, so the pattern can be embedded in pandas str.extract
+        self.pattern = f"{_WORD_START}(?:{_trie_pattern(self.keywords)}){_WORD_END}" if self.keywords else r'(?!x)x'
+        self.regex = re.compile(self.pattern)
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self.ids
+
+    def contains(self, text: str) -> bool:
+        """True if any keyword occurs in the text"""
+        return self.regex.search(text) is not None
+
+    def first(self, text: str) -> Optional[str]:
+        """Leftmost keyword in the text"""
+        match = self.regex.search(text)
+        return match.group(0) if match else None
+
+    def best(self, text: str) -> Optional[str]:
+        """Highest-priority keyword in the text, by list order"""
+        found = self.distinct(text)
+        return min(found, key=self.ids.__getitem__) if found else None
+
+    def find_all(self, text: str) -> List[str]:
+        """Every keyword occurrence, left to right"""
+        return self.regex.findall(text)
+
+    def distinct(self, text: str) -> Set[str]:
+        """Set of keywords occurring in the text"""
+        return set(self.regex.findall(text))
+
+
+# Shared matchers, compiled once at import
+quality_matcher = KeywordMatcher(QUALITY_WORDS)
+storage_matcher = KeywordMatcher(STORAGE_WORDS)
+phone_matcher = KeywordMatcher(PHONE_WORDS)
+computer_matcher = KeywordMatcher(COMPUTER_WORDS)
@@ -0,0 +1,142 @@
+"""
+Out-of-core TF-IDF fitting: vocabulary and idf weights from streamed text chunks
+"""
+import heapq
+import logging
+from typing import Callable, Iterable, Sequence
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.utils import murmurhash3_32
+
+logger = logging.getLogger(__name__)
+
+TextChunks = Callable[[], Iterable[Sequence[str]]]
+
+
+class CountMinSketch:
+    """Approximate per-term counts in fixed memory.
+
+    Each of the depth rows maps a term to one of width counters; a term's
+    estimate is the smallest of its counters. Collisions only add, so an
+    estimate is never below the true count.
+    """
+
+    def __init__(self, width: int = 2 ** 20, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    def _buckets(self, terms: Sequence[str]) -> np.ndarray:
+        """(depth, n_terms) counter positions, by double hashing two murmur hashes"""
+        h1 = np.fromiter((murmurhash3_32(t, seed=0, positive=True) for t in terms), dtype=np.uint64, count=len(terms))
+        h2 = np.fromiter((murmurhash3_32(t, seed=1, positive=True) for t in terms), dtype=np.uint64, count=len(terms))
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((h1 + rows * (h2 | 1)) % np.uint64(self.width)).astype(np.intp)
+
+    def add(self, terms: Sequence[str], counts: np.ndarray):
+        for row, buckets in zip(self.table, self._buckets(terms)):
+            np.add.at(row, buckets, counts)
+
+    def estimate(self, terms: Sequence[str]) -> np.ndarray:
+        buckets = self._buckets(terms)
+        return self.table[np.arange(self.depth)[:, None], buckets].min(axis=0)
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes
+
+
+def _chunk_counts(counter: CountVectorizer, texts: Sequence[str]):
+    """(terms, term frequencies, document frequencies) of one chunk; all empty if it has no terms"""
+    try:
+        X = counter.fit_transform(texts)
+    except ValueError as e:
+        # A chunk of empty or stop-word-only texts: its documents still count toward idf
+        if 'empty vocabulary' not in str(e):
+            raise
+        return np.array([], dtype=object), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    terms = counter.get_feature_names_out()
+    tfs = np.asarray(X.sum(axis=0)).ravel()
+    dfs = np.bincount(X.indices, minlength=len(terms))
+    return terms, tfs, dfs
+
+
+def fit_tfidf_out_of_core(text_chunks: TextChunks, max_features: int = 10000, ngram_range=(1, 2), min_df=2,
+                          max_df=1.0, stop_words='english', dtype=np.float64, sketch_width: int = 2 ** 20,
+                          sketch_depth: int = 4, max_candidates: int = None) -> TfidfVectorizer:
+    """A fitted TfidfVectorizer from text that is streamed twice, never held whole.
+
+    text_chunks is called once per pass and must yield the same chunks of
+    cleaned texts each time. Pass one only feeds term frequencies into a
+    count-min sketch. Pass two counts exact term and document frequencies
+    for the terms whose sketch estimate ranks among the top max_candidates
+    (10 x max_features by default); the admission threshold only rises, so
+    every term that survives was counted from its first occurrence. The
+    vocabulary is then chosen like TfidfVectorizer.fit: min_df/max_df on
+    document frequency, the max_features most frequent terms, smooth idf.
+
+    Memory is the sketch, the candidate table and one chunk's n-grams.
+    Terms are only missed if sketch collisions push more than
+    max_candidates other terms above them; ties in frequency at the
+    max_features cut go to the alphabetically first term.
+    """
+    max_candidates = max_candidates or 10 * max_features
+    counter = CountVectorizer(ngram_range=ngram_range, stop_words=stop_words, dtype=np.int64)
+
+    # Pass 1: approximate term frequencies
+    sketch = CountMinSketch(sketch_width, sketch_depth)
+    n_docs = 0
+    for texts in text_chunks():
+        if len(texts) == 0:
+            continue
+        terms, tfs, _ = _chunk_counts(counter, texts)
+        if len(terms):
+            sketch.add(terms, tfs)
+        n_docs += len(texts)
+    if n_docs == 0:
+        raise ValueError("No documents to fit the vectorizer on")
+    logger.info(f"📊 Sketched term frequencies of {n_docs:,} documents ({sketch.nbytes / 2**20:.0f}MB)")
+
+    # Pass 2: exact counts for terms whose estimate clears a rising threshold
+    candidates = {}
+    threshold = 1
+    for texts in text_chunks():
+        if len(texts) == 0:
+            continue
+        terms, tfs, dfs = _chunk_counts(counter, texts)
+        if not len(terms):
+            continue
+        estimates = sketch.estimate(terms)
+        admitted = np.flatnonzero(estimates >= threshold)
+        for term, tf, df, estimate in zip(terms[admitted], tfs[admitted], dfs[admitted], estimates[admitted]):
+            entry = candidates.get(term)
+            if entry is None:
+                candidates[term] = [int(tf), int(df), int(estimate)]
+            else:
+                entry[0] += int(tf)
+                entry[1] += int(df)
+
+        if len(candidates) > max_candidates:
+            cutoff = heapq.nlargest(max_candidates, (entry[2] for entry in candidates.values()))[-1]
+            threshold = cutoff + 1
+            candidates = {term: entry for term, entry in candidates.items() if entry[2] >= threshold}
+
+    # Vocabulary selection as in CountVectorizer._limit_features
+    low = min_df if isinstance(min_df, int) else min_df * n_docs
+    high = max_df if isinstance(max_df, int) else max_df * n_docs
+    kept = [(term, tf, df) for term, (tf, df, _) in candidates.items() if low <= df <= high]
+    if not kept:
+        raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+    if max_features is not None and len(kept) > max_features:
+        kept = heapq.nsmallest(max_features, kept, key=lambda item: (-item[1], item[0]))
+    kept.sort()
+
+    vectorizer = TfidfVectorizer(max_features=max_features, ngram_range=ngram_range, min_df=min_df,
+                                 max_df=max_df, stop_words=stop_words, dtype=dtype)
+    vectorizer.vocabulary_ = {term: index for index, (term, _, _) in enumerate(kept)}
+    dfs = np.array([df for _, _, df in kept], dtype=np.float64)
+    vectorizer.idf_ = (np.log((n_docs + 1) / (dfs + 1)) + 1).astype(dtype)
+
+    logger.info(f"✅ Fitted {len(kept):,}-term vocabulary from {len(candidates):,} candidates (threshold {threshold})")
+    return vectorizer
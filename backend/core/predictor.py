@@ -2,23 +2,89 @@
 AmazeWorth Smart Price Engine - ML Model Integration
 """
 import joblib
-import pickle
 import numpy as np
-import pandas as pd
 import re
-import os
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import LabelEncoder
+import hashlib
+import zlib
+from datetime import datetime
+from pathlib import Path
 import logging
 
+from core.artifacts import artifact_registry, load_pickle
+from core.brand_vocabulary import BrandVocabulary
+from core.fast_tfidf import FastTfidfVectorizer
+from core.feature_assembly import NUMERIC_COLUMNS, FeatureAssembler
+from core.inference_backends import create_inference_backend
+from core.hashed_tfidf import HashedTfidfVectorizer
+from core.keywords import quality_matcher, storage_matcher, phone_matcher, computer_matcher
+from core.text_normalization import normalize_text
+from config.settings import ML_CONFIG, MODEL_DIR, MODEL_VERSIONS_DIR
+
 logger = logging.getLogger(__name__)
 
+# Numeric columns after the text features: text_len, word_count, brand code, has_quality
+NUMERIC_FEATURES = len(NUMERIC_COLUMNS)
+
+# Label of the artifacts directly in MODEL_DIR
+DEFAULT_MODEL_LABEL = 'default'
+
+# Product scored before a new model version is activated
+WARMUP_TITLE = "Apple iPhone 14 Pro Max 256GB"
+WARMUP_DESCRIPTION = "Premium smartphone with advanced camera system"
+
+class PredictionFeatures:
+    """Features extracted once per request and shared by every prediction stage"""
+    
+    __slots__ = ('combined_text', 'text_len', 'word_count', 'brand', 'has_quality')
+    
+    def __init__(self, combined_text, text_len, word_count, brand, has_quality):
+        self.combined_text = combined_text
+        self.text_len = text_len
+        self.word_count = word_count
+        self.brand = brand
+        self.has_quality = has_quality
+    
+    def __repr__(self):
+        return (f"PredictionFeatures(brand={self.brand!r}, text_len={self.text_len}, "
+                f"word_count={self.word_count}, has_quality={self.has_quality})")
+
+class ModelValidationError(ValueError):
+    """Raised when a candidate model version fails its pre-activation checks"""
+
+
+class ModelBundle:
+    """Artifacts of one model version, activated together as a unit"""
+    
+    __slots__ = ('model', 'scorer', 'tfidf_vectorizer', 'text_vectorizer', 'brand_vocabulary', 'assembler',
+                 'version', 'label', 'model_dir', 'artifact_names', 'loaded_at')
+    
+    def __init__(self, model=None, scorer=None, tfidf_vectorizer=None, text_vectorizer=None, brand_vocabulary=None,
+                 version='heuristic', label=None, model_dir=None, artifact_names=()):
+        self.model = model
+        self.scorer = scorer
+        self.tfidf_vectorizer = tfidf_vectorizer
+        self.text_vectorizer = text_vectorizer
+        self.brand_vocabulary = brand_vocabulary or BrandVocabulary.default()
+        self.assembler = FeatureAssembler.for_vectorizer(text_vectorizer) if text_vectorizer is not None else None
+        self.version = version
+        self.label = label
+        self.model_dir = model_dir
+        self.artifact_names = tuple(artifact_names)
+        self.loaded_at = datetime.now()
+    
+    def to_dict(self):
+        return {
+            'active_version': self.label,
+            'model_version': self.version,
+            'model_dir': str(self.model_dir) if self.model_dir else None,
+            'inference': self.scorer.to_dict() if self.scorer else None,
+            'loaded_at': self.loaded_at.isoformat()
+        }
+
 class SmartPricePredictor:
     def __init__(self):
-        self.model = None
-        self.tfidf_vectorizer = None
-        self.brand_encoder = None
-        self.model_loaded = False
+        # Every prediction reads this reference once, so a reload swaps all artifacts at once
+        self.bundle = ModelBundle()
         self.model_stats = {
             'smape_score': 35.1,
             'accuracy': 95.2,
@@ -28,145 +94,303 @@ class SmartPricePredictor:
             'features_used': ['text_analysis', 'brand_detection', 'quality_indicators', 'length_features']
         }
     
-    def load_models(self):
-        """Load trained models from models folder"""
+    @property
+    def model(self):
+        return self.bundle.model
+    
+    @property
+    def tfidf_vectorizer(self):
+        return self.bundle.tfidf_vectorizer
+    
+    @property
+    def text_vectorizer(self):
+        return self.bundle.text_vectorizer
+    
+    @property
+    def brand_vocabulary(self):
+        return self.bundle.brand_vocabulary
+    
+    @property
+    def model_loaded(self):
+        return self.bundle.model is not None
+    
+    @property
+    def model_version(self):
+        return self.bundle.version
+    
+    @staticmethod
+    def version_dir(version):
+        """Directory of a named model version under MODEL_VERSIONS_DIR"""
+        if not re.fullmatch(r'[A-Za-z0-9][\w.\-]*', version or ''):
+            raise ValueError(f"Invalid model version name: {version!r}")
+        model_dir = MODEL_VERSIONS_DIR / version
+        if not (model_dir / ML_CONFIG['model_file']).exists():
+            raise FileNotFoundError(f"Model version {version!r} not found in {MODEL_VERSIONS_DIR}")
+        return model_dir
+    
+    @staticmethod
+    def available_versions():
+        """Names of the version directories that contain a model file"""
+        if not MODEL_VERSIONS_DIR.is_dir():
+            return []
+        return sorted(d.name for d in MODEL_VERSIONS_DIR.iterdir() if (d / ML_CONFIG['model_file']).exists())
+    
+    def load_models(self, model_dir=None, label=DEFAULT_MODEL_LABEL):
+        """Load trained models from models folder (or a version directory) and activate them"""
         try:
-            from pathlib import Path
-            model_dir = Path(__file__).parent.parent / 'models'
-            
-            # Load LightGBM model
-            model_path = model_dir / 'lgbm_final_model.pkl'
-            if model_path.exists():
-                self.model = joblib.load(str(model_path))
-                logger.info(f"✅ LightGBM model loaded from {model_path}")
-            else:
-                logger.warning(f"❌ LightGBM model not found at {model_path}")
-                return False
-            
-            # Load TF-IDF vectorizer
-            vectorizer_path = model_dir / 'tfidf_vectorizer.pkl'
-            if vectorizer_path.exists():
-                with open(str(vectorizer_path), 'rb') as f:
-                    self.tfidf_vectorizer = pickle.load(f)
-                logger.info(f"✅ TF-IDF vectorizer loaded from {vectorizer_path}")
-            else:
-                logger.warning(f"❌ TF-IDF vectorizer not found at {vectorizer_path}")
-                return False
-            
-            # Create simple brand encoder since file doesn't exist
-            from sklearn.preprocessing import LabelEncoder
-            self.brand_encoder = LabelEncoder()
-            brands = ['apple', 'samsung', 'sony', 'nike', 'adidas', 'lg', 'hp', 'dell', 'lenovo', 'asus', 'unknown']
-            self.brand_encoder.fit(brands)
-            logger.info("✅ Brand encoder created with common brands")
-            
-            self.model_loaded = True
-            logger.info("✅ All ML Models loaded successfully")
+            self.activate(self.load_bundle(model_dir, label))
+            logger.info(f"✅ All ML Models loaded successfully (version {self.model_version})")
             return True
             
         except Exception as e:
             logger.error(f"❌ Model loading failed: {e}")
             return False
     
-    def preprocess_text(self, title, description=""):
-        """Preprocess text for prediction"""
-        combined_text = f"{title} {description}".lower()
+    def load_bundle(self, model_dir=None, label=DEFAULT_MODEL_LABEL):
+        """Load every artifact of one model directory without touching the active bundle"""
+        model_dir = Path(model_dir) if model_dir else MODEL_DIR
         
-        # Clean text
-        combined_text = re.sub(r'[^a-zA-Z0-9\s]', ' ', combined_text)
-        combined_text = re.sub(r'\s+', ' ', combined_text).strip()
+        # Registry names are per version, so a candidate never replaces the active artifacts
+        def name(artifact):
+            return artifact if label == DEFAULT_MODEL_LABEL else f"{artifact}@{label}"
         
-        return combined_text
+        # Load LightGBM model
+        model_path = model_dir / ML_CONFIG['model_file']
+        if not model_path.exists():
+            raise FileNotFoundError(f"LightGBM model not found at {model_path}")
+        model = artifact_registry.load(name('lgbm_model'), model_path, lambda: joblib.load(str(model_path)))
+        logger.info(f"✅ LightGBM model loaded from {model_path}")
+        
+        # Load TF-IDF vectorizer
+        if ML_CONFIG['text_features'] == 'hashing':
+            vectorizer_path = model_dir / ML_CONFIG['hashed_vectorizer_file']
+            if not vectorizer_path.exists():
+                raise FileNotFoundError(f"Hashed TF-IDF artifact not found at {vectorizer_path}")
+            # No vocabulary to load; idf weights are memory-mapped
+            tfidf_vectorizer = artifact_registry.load(
+                name('tfidf_vectorizer'), vectorizer_path, lambda: HashedTfidfVectorizer.load(vectorizer_path)
+            )
+            text_vectorizer = tfidf_vectorizer
+            names = [name('lgbm_model'), name('tfidf_vectorizer')]
+            logger.info(f"✅ Hashed TF-IDF loaded from {vectorizer_path} ({tfidf_vectorizer.n_features:,} features)")
+        else:
+            vectorizer_path = model_dir / ML_CONFIG['vectorizer_file']
+            if not vectorizer_path.exists():
+                raise FileNotFoundError(f"TF-IDF vectorizer not found at {vectorizer_path}")
+            tfidf_vectorizer = artifact_registry.load(
+                name('tfidf_vectorizer'), vectorizer_path, lambda: load_pickle(vectorizer_path)
+            )
+            names = [name('lgbm_model'), name('tfidf_vectorizer')]
+            logger.info(f"✅ TF-IDF vectorizer loaded from {vectorizer_path}")
+            
+            # Inference-only copy with identical output; sklearn remains the fallback
+            try:
+                text_vectorizer = artifact_registry.load(
+                    name('fast_tfidf'), vectorizer_path, lambda: FastTfidfVectorizer.from_sklearn(tfidf_vectorizer)
+                )
+                names.append(name('fast_tfidf'))
+            except ValueError as e:
+                logger.warning(f"⚠️ Fast TF-IDF path unavailable ({e}), using sklearn transform")
+                text_vectorizer = tfidf_vectorizer
+        
+        # Brand vocabulary: versioned artifact, pickled encoder, or built-in brands
+        vocabulary_sources = [model_dir / ML_CONFIG['brand_vocabulary_file'], model_dir / ML_CONFIG['brand_encoder_file']]
+        brand_vocabulary = artifact_registry.load(
+            name('brand_vocabulary'),
+            next((path for path in vocabulary_sources if path.exists()), None),
+            lambda: BrandVocabulary.load(model_dir, ML_CONFIG['brand_vocabulary_file'], ML_CONFIG['brand_encoder_file'])
+        )
+        names.append(name('brand_vocabulary'))
+        
+        artifact_paths = [model_path] + (getattr(tfidf_vectorizer, 'artifact_paths', None) or [vectorizer_path])
+        return ModelBundle(
+            model=model,
+            scorer=create_inference_backend(model, ML_CONFIG['inference_backend'], ML_CONFIG['inference_threads']),
+            tfidf_vectorizer=tfidf_vectorizer,
+            text_vectorizer=text_vectorizer,
+            brand_vocabulary=brand_vocabulary,
+            version=self._artifact_version(artifact_paths, brand_vocabulary.version),
+            label=label,
+            model_dir=model_dir,
+            artifact_names=names
+        )
     
-    def extract_features(self, title, description=""):
-        """Extract features similar to training pipeline"""
+    def validate_bundle(self, bundle):
+        """Check feature dimensions and run a warm-up prediction; raises ModelValidationError"""
+        try:
+            # The candidate's own vocabulary: its brand codes may differ from the active bundle's
+            features = self.extract_features(WARMUP_TITLE, WARMUP_DESCRIPTION, bundle.brand_vocabulary)
+            X = self._feature_matrix([features], bundle)
+        except Exception as e:
+            raise ModelValidationError(f"Feature extraction failed: {e}") from e
+        
+        expected_features = getattr(bundle.model, 'n_features_in_', None)
+        if expected_features is not None and X.shape[1] != expected_features:
+            raise ModelValidationError(f"Feature mismatch: vectorizer produces {X.shape[1]}, model expects {expected_features}")
+        
+        try:
+            log_prices = bundle.scorer.predict(X)
+        except Exception as e:
+            raise ModelValidationError(f"Warm-up prediction failed: {e}") from e
+        if not np.all(np.isfinite(log_prices)):
+            raise ModelValidationError("Warm-up prediction is not finite")
+    
+    def activate(self, bundle):
+        """Swap in a loaded bundle; returns the previously active one"""
+        previous, self.bundle = self.bundle, bundle
+        return previous
+    
+    @staticmethod
+    def _artifact_version(paths, vocabulary_version=''):
+        """Short identifier derived from the loaded artifact files"""
+        digest = hashlib.blake2b(vocabulary_version.encode(), digest_size=6)
+        for path in paths:
+            stat = path.stat()
+            digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()
+    
+    def preprocess_text(self, title, description=""):
+        """Preprocess text for prediction"""
+        return normalize_text(f"{title} {description}")
+    
+    def extract_features(self, title, description="", brand_vocabulary=None):
+        """Extract features similar to training pipeline, detecting brands with the active or given vocabulary"""
         combined_text = self.preprocess_text(title, description)
+        brand_vocabulary = brand_vocabulary or self.brand_vocabulary
         
         # Text features
         text_len = len(combined_text)
         word_count = len(combined_text.split())
         
-        # Brand detection
-        brands = ['apple', 'samsung', 'sony', 'nike', 'adidas', 'lg', 'hp', 'dell', 'lenovo', 'asus']
-        detected_brand = 'unknown'
-        for brand in brands:
-            if brand in combined_text:
-                detected_brand = brand
-                break
+        # Brand detection (whole words, highest-priority brand wins)
+        detected_brand = brand_vocabulary.detect(combined_text)
         
         # Quality indicators
-        quality_words = ['premium', 'luxury', 'professional', 'pro', 'ultra', 'max']
-        has_quality = any(word in combined_text for word in quality_words)
+        has_quality = quality_matcher.contains(combined_text)
         
+        return PredictionFeatures(
+            combined_text=combined_text,
+            text_len=text_len,
+            word_count=word_count,
+            brand=detected_brand,
+            has_quality=int(has_quality)
+        )
+    
+    def predict(self, title, description=""):
+        """Predict price, confidence and key features from a single feature pass"""
+        return self.predict_from_features(self.extract_features(title, description))
+    
+    def predict_from_features(self, features):
+        """Predict price, confidence and key features from extracted features, with the scoring model version"""
+        bundle = self.bundle
         return {
-            'combined_text': combined_text,
-            'text_len': text_len,
-            'word_count': word_count,
-            'brand': detected_brand,
-            'has_quality': int(has_quality)
+            'predicted_price': self._price_from_features(features, bundle),
+            'confidence_score': self._confidence_from_features(features),
+            'key_features': self._key_features_from_features(features),
+            'model_version': bundle.version
         }
     
     def predict_price(self, title, description=""):
         """Predict price using ML model or fallback"""
-        if self.model_loaded and self.model is not None:
+        return self._price_from_features(self.extract_features(title, description))
+    
+    def _price_from_features(self, features, bundle=None):
+        """Predict price from extracted features using ML model or fallback"""
+        bundle = bundle or self.bundle
+        if bundle.model is not None:
             try:
-                return self._ml_prediction(title, description)
+                return self._ml_prediction_batch([features], bundle)[0]
             except Exception as e:
                 logger.warning(f"ML prediction failed, using heuristic: {e}")
         
         # Always fall back to heuristic if ML fails
-        return self._intelligent_heuristic_prediction(title, description)
+        return self._heuristic_from_features(features)
     
-    def _ml_prediction(self, title, description):
-        """Use trained ML model for prediction"""
-        try:
-            features = self.extract_features(title, description)
-            
-            # TF-IDF features
-            text_features = self.tfidf_vectorizer.transform([features['combined_text']])
-            
-            # Brand encoding
+    def predict_batch(self, titles, descriptions=None):
+        """Predict price, confidence and key features for many products at once"""
+        if descriptions is None:
+            descriptions = [""] * len(titles)
+        features = [self.extract_features(title, description) for title, description in zip(titles, descriptions)]
+        return self.predict_batch_from_features(features)
+    
+    def predict_batch_from_features(self, features):
+        """Predict price, confidence and key features for many extracted feature sets, with the scoring model version"""
+        bundle = self.bundle
+        prices = self.predict_price_batch(features, bundle)
+        return [
+            {
+                'predicted_price': price,
+                'confidence_score': self._confidence_from_features(f),
+                'key_features': self._key_features_from_features(f),
+                'model_version': bundle.version
+            }
+            for price, f in zip(prices, features)
+        ]
+    
+    def predict_price_batch(self, features, bundle=None):
+        """Prices for many extracted feature sets: one model call, heuristic fallback"""
+        bundle = bundle or self.bundle
+        if features and bundle.model is not None:
             try:
-                brand_encoded = self.brand_encoder.transform([features['brand']])[0]
-            except:
-                brand_encoded = self.brand_encoder.transform(['unknown'])[0]
-            
-            # Numerical features matching training
-            numerical_features = np.array([[
-                features['text_len'],
-                features['word_count'],
-                brand_encoded,
-                features['has_quality']
-            ]])
-            
-            # Combine features as in training
-            from scipy.sparse import hstack, csr_matrix
-            X = hstack([text_features, csr_matrix(numerical_features)])
-            
-            # Check feature count match
-            expected_features = getattr(self.model, 'n_features_in_', None)
-            if expected_features and X.shape[1] != expected_features:
-                logger.warning(f"Feature mismatch: got {X.shape[1]}, expected {expected_features}. Using fallback.")
-                raise ValueError("Feature dimension mismatch")
-            
-            # Predict (model outputs log price)
-            log_price = self.model.predict(X)[0]
-            price = np.expm1(log_price)  # Convert back from log
-            
-            return max(50, min(150000, round(price, 2)))
-            
-        except Exception as e:
-            logger.error(f"ML prediction failed: {e}")
-            # Fall back to heuristic
-            raise e
+                return self._ml_prediction_batch(features, bundle)
+            except Exception as e:
+                logger.warning(f"Batch ML prediction failed, using heuristic: {e}")
+        
+        return [self._heuristic_from_features(f) for f in features]
+    
+    def _feature_matrix(self, features, bundle):
+        """Model input for extracted features, built with one bundle's artifacts.
+        
+        The matrix uses the assembler's per-thread buffers; score it before
+        assembling the next one on the same thread.
+        """
+        # Single request: text weights go straight into the row buffers
+        if len(features) == 1 and hasattr(bundle.text_vectorizer, 'row'):
+            f = features[0]
+            indices, values = bundle.text_vectorizer.row(f.combined_text)
+            tail = (f.text_len, f.word_count, bundle.brand_vocabulary.encode(f.brand), f.has_quality)
+            return bundle.assembler.row(indices, values, tail)
+        
+        # TF-IDF features
+        text_features = bundle.text_vectorizer.transform([f.combined_text for f in features])
+        
+        # Numerical features matching training (unknown brands map to 'unknown')
+        numerical_features = np.empty((len(features), NUMERIC_FEATURES), dtype=np.float64)
+        numerical_features[:, 0] = [f.text_len for f in features]
+        numerical_features[:, 1] = [f.word_count for f in features]
+        numerical_features[:, 2] = bundle.brand_vocabulary.encode_batch([f.brand for f in features])
+        numerical_features[:, 3] = [f.has_quality for f in features]
+        
+        # Combine features as in training: text columns, then the numeric tail
+        return bundle.assembler.rows(text_features, numerical_features)
+    
+    def _ml_prediction_batch(self, features, bundle=None):
+        """Score extracted features with one TF-IDF transform and one model call"""
+        bundle = bundle or self.bundle
+        X = self._feature_matrix(features, bundle)
+        
+        # Check feature count match
+        expected_features = getattr(bundle.model, 'n_features_in_', None)
+        if expected_features and X.shape[1] != expected_features:
+            logger.warning(f"Feature mismatch: got {X.shape[1]}, expected {expected_features}. Using fallback.")
+            raise ValueError("Feature dimension mismatch")
+        
+        # Predict (model outputs log price)
+        log_prices = bundle.scorer.predict(X)
+        prices = np.expm1(log_prices)  # Convert back from log
+        
+        return [float(max(50, min(150000, round(price, 2)))) for price in prices]
     
     def _intelligent_heuristic_prediction(self, title, description):
         """Advanced heuristic prediction"""
-        features = self.extract_features(title, description)
-        text = features['combined_text']
+        return self._heuristic_from_features(self.extract_features(title, description))
+    
+    def _heuristic_from_features(self, features):
+        """Advanced heuristic prediction from extracted features"""
+        text = features.combined_text
         
         # Base price calculation
-        base_price = features['word_count'] * 25
+        base_price = features.word_count * 25
         
         # Brand multipliers
         brand_multipliers = {
@@ -175,26 +399,26 @@ class SmartPricePredictor:
             'hp': 1.7, 'dell': 1.6, 'lenovo': 1.4, 'asus': 1.5
         }
         
-        multiplier = brand_multipliers.get(features['brand'], 1.0)
+        multiplier = brand_multipliers.get(features.brand, 1.0)
         
         # Quality multipliers
-        if features['has_quality']:
+        if features.has_quality:
             multiplier *= 1.6
         
         # Storage/capacity
-        if any(storage in text for storage in ['1tb', '512gb', '256gb']):
+        if storage_matcher.contains(text):
             multiplier *= 1.4
         
         # Category adjustments
-        if any(cat in text for cat in ['smartphone', 'phone']):
+        if phone_matcher.contains(text):
             base_price = max(base_price, 400)
-        elif any(cat in text for cat in ['laptop', 'computer']):
+        elif computer_matcher.contains(text):
             base_price = max(base_price, 600)
         
         final_price = base_price * multiplier
         
         # Deterministic variance
-        hash_val = hash(text) % 1000
+        hash_val = zlib.crc32(text.encode('utf-8')) % 1000
         variance = (hash_val - 500) * final_price * 0.0001
         final_price += variance
         
@@ -202,8 +426,10 @@ class SmartPricePredictor:
     
     def get_confidence(self, title, description=""):
         """Calculate prediction confidence"""
-        features = self.extract_features(title, description)
-        
+        return self._confidence_from_features(self.extract_features(title, description))
+    
+    def _confidence_from_features(self, features):
+        """Calculate prediction confidence from extracted features"""
         base_confidence = 0.75
         
         # ML model increases confidence
@@ -211,34 +437,37 @@ class SmartPricePredictor:
             base_confidence += 0.15
         
         # Brand recognition
-        if features['brand'] != 'unknown':
+        if features.brand != 'unknown':
             base_confidence += 0.1
         
         # Quality indicators
-        if features['has_quality']:
+        if features.has_quality:
             base_confidence += 0.05
         
         # Text length
-        if features['word_count'] > 10:
+        if features.word_count > 10:
             base_confidence += 0.05
         
         return min(0.95, base_confidence)
     
     def get_key_features(self, title, description=""):
         """Extract key features that influenced pricing"""
-        features = self.extract_features(title, description)
+        return self._key_features_from_features(self.extract_features(title, description))
+    
+    def _key_features_from_features(self, features):
+        """Key features that influenced pricing, from extracted features"""
         key_features = []
         
-        if features['brand'] != 'unknown':
-            key_features.append(f"Brand: {features['brand'].title()}")
+        if features.brand != 'unknown':
+            key_features.append(f"Brand: {features.brand.title()}")
         
-        if features['has_quality']:
+        if features.has_quality:
             key_features.append("Premium Quality")
         
-        if features['word_count'] > 15:
+        if features.word_count > 15:
             key_features.append("Detailed Description")
         
-        if features['text_len'] > 100:
+        if features.text_len > 100:
             key_features.append("Rich Content")
         
         # Add some ML-based features if model is loaded
@@ -3,109 +3,178 @@ Data processing utilities for AmazeWorth Smart Price Engine
 """
 import pandas as pd
 import numpy as np
-import re
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import LabelEncoder
 import pickle
+from pathlib import Path
+
+from core.brand_vocabulary import BrandVocabulary
+from core.feature_assembly import NUMERIC_COLUMNS, FeatureAssembler
+from core.hashed_tfidf import HashedTfidfVectorizer
+from core.out_of_core_tfidf import fit_tfidf_out_of_core
+from core.keywords import quality_matcher
+from core.text_normalization import normalize_series, normalize_text
+
+# Rows per chunk when fitting and transforming training CSVs out of core
+DEFAULT_CHUNK_ROWS = 50_000
 
 class DataProcessor:
-    def __init__(self):
+    def __init__(self, text_features='vocabulary', hash_features=2 ** 18, text_workers=1):
+        # 'vocabulary' fits a TfidfVectorizer; 'hashing' fits idf weights over hashed features
+        self.text_features = text_features
+        self.hash_features = hash_features
+        # Processes used to clean distinct titles/descriptions on large datasets
+        self.text_workers = text_workers
         self.tfidf_vectorizer = None
         self.brand_encoder = None
+        self.brand_vocabulary = BrandVocabulary.default()
         
     def clean_text(self, text):
         """Clean and preprocess text data"""
-        if pd.isna(text):
-            return ""
-        
-        text = str(text).lower()
-        # Remove special characters but keep spaces
-        text = re.sub(r'[^a-zA-Z0-9\s]', ' ', text)
-        # Remove extra whitespaces
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
-    
-    def extract_features(self, df):
-        """Extract features from product data"""
-        # Clean text
-        df['title_clean'] = df['title'].apply(self.clean_text)
-        df['description_clean'] = df['description'].fillna('').apply(self.clean_text)
-        
-        # Combine text
-        df['combined_text'] = df['title_clean'] + ' ' + df['description_clean']
-        
-        # Text features
-        df['text_length'] = df['combined_text'].str.len()
-        df['word_count'] = df['combined_text'].str.split().str.len()
-        df['title_length'] = df['title_clean'].str.len()
-        
-        # Brand extraction (simple approach)
-        df['brand'] = df['title_clean'].str.extract(r'(apple|samsung|sony|nike|adidas|lg|hp|dell|lenovo|asus)', expand=False)
-        df['brand'] = df['brand'].fillna('unknown')
-        
-        # Quality indicators
-        quality_words = ['premium', 'luxury', 'professional', 'pro', 'ultra', 'max', 'deluxe', 'elite']
-        df['has_quality_word'] = df['combined_text'].str.contains('|'.join(quality_words)).astype(int)
-        
-        # Storage indicators
-        storage_pattern = r'(\d+)(gb|tb)'
-        df['has_storage'] = df['combined_text'].str.contains(storage_pattern).astype(int)
-        
-        return df
+        return normalize_text(text)
     
-    def prepare_training_data(self, df):
-        """Prepare data for model training"""
-        # Extract features
-        df = self.extract_features(df)
+    def text_features_matrix(self, texts, dtype=np.float64):
+        """TF-IDF matrix of cleaned texts, fitting the vectorizer on first use"""
+        if self.tfidf_vectorizer is not None:
+            return self.tfidf_vectorizer.transform(texts)
         
-        # TF-IDF vectorization
-        if self.tfidf_vectorizer is None:
+        if self.text_features == 'hashing':
+            self.tfidf_vectorizer = HashedTfidfVectorizer(
+                n_features=self.hash_features,
+                ngram_range=(1, 2),
+                stop_words='english'
+            )
+        else:
             self.tfidf_vectorizer = TfidfVectorizer(
                 max_features=10000,
                 ngram_range=(1, 2),
                 min_df=2,
-                stop_words='english'
+                stop_words='english',
+                dtype=dtype
             )
-            X_text = self.tfidf_vectorizer.fit_transform(df['combined_text'])
-        else:
-            X_text = self.tfidf_vectorizer.transform(df['combined_text'])
+        return self.tfidf_vectorizer.fit_transform(texts)
+    
+    def combined_text(self, df):
+        """Cleaned "title description" per row, as SmartPricePredictor.preprocess_text builds it"""
+        title = df['title'].fillna('').astype(str)
+        description = df['description'].fillna('').astype(str) if 'description' in df else ''
+        return normalize_series(title + ' ' + description, workers=self.text_workers)
+    
+    def fit_text_vectorizer_out_of_core(self, path, chunk_rows=DEFAULT_CHUNK_ROWS, dtype=np.float32):
+        """Fit the text vectorizer on a CSV streamed in chunks instead of loaded whole.
         
-        # Brand encoding
-        if self.brand_encoder is None:
-            self.brand_encoder = LabelEncoder()
-            X_brand = self.brand_encoder.fit_transform(df['brand']).reshape(-1, 1)
+        Hashing features need one pass of exact document frequencies; the
+        vocabulary vectorizer takes two passes through fit_tfidf_out_of_core.
+        """
+        def text_chunks():
+            for chunk in pd.read_csv(path, usecols=lambda c: c in ('title', 'description'), chunksize=chunk_rows):
+                yield self.combined_text(chunk).tolist()
+        
+        if self.text_features == 'hashing':
+            self.tfidf_vectorizer = HashedTfidfVectorizer(
+                n_features=self.hash_features,
+                ngram_range=(1, 2),
+                stop_words='english'
+            ).fit_chunks(text_chunks())
         else:
-            X_brand = self.brand_encoder.transform(df['brand']).reshape(-1, 1)
+            self.tfidf_vectorizer = fit_tfidf_out_of_core(
+                text_chunks,
+                max_features=10000,
+                ngram_range=(1, 2),
+                min_df=2,
+                stop_words='english',
+                dtype=dtype
+            )
+        return self.tfidf_vectorizer
+    
+    def iter_training_matrices(self, path, chunk_rows=DEFAULT_CHUNK_ROWS, dtype=np.float32):
+        """(X, y) per CSV chunk from the fitted vectorizer; y is log1p(price), or None without prices.
         
-        # Numerical features
-        numerical_cols = ['text_length', 'word_count', 'title_length', 'has_quality_word', 'has_storage']
-        X_numerical = df[numerical_cols].values
+        The vectorizer must already be fitted (fit_text_vectorizer_out_of_core
+        or load_processors); fitting it on the first chunk would give every
+        later chunk a vocabulary seen on that chunk alone.
+        """
+        if self.tfidf_vectorizer is None:
+            raise ValueError("Text vectorizer is not fitted; call fit_text_vectorizer_out_of_core "
+                             "or load_processors before iter_training_matrices")
+        for chunk in pd.read_csv(path, chunksize=chunk_rows):
+            y = np.log1p(chunk['price'].to_numpy(dtype=np.float64)) if 'price' in chunk else None
+            yield self.build_training_matrix(chunk, dtype=dtype), y
+    
+    def build_training_matrix(self, df, dtype=np.float32):
+        """Model input for a title/description frame as one CSR matrix.
         
-        return X_text, X_brand, X_numerical, df
+        Columns follow the serving layout (FeatureAssembler.for_vectorizer):
+        TF-IDF features, then text_len, word_count, brand code and
+        has_quality, computed exactly as SmartPricePredictor.extract_features
+        does. Values are written straight into the CSR arrays in dtype; no
+        feature columns are added to df and no dense numeric copy is made.
+        Brand and quality lookups run once per distinct text.
+        """
+        combined_text = self.combined_text(df)
+        codes, texts = pd.factorize(combined_text)
+        texts = texts.tolist()
+        tail = np.empty((len(texts), len(NUMERIC_COLUMNS)), dtype=dtype)
+        tail[:, 0] = [len(t) for t in texts]
+        tail[:, 1] = [len(t.split()) for t in texts]
+        tail[:, 2] = self.brand_vocabulary.encode_batch(self.brand_vocabulary.detect(t) for t in texts)
+        tail[:, 3] = [quality_matcher.contains(t) for t in texts]
+        
+        X_text = self.text_features_matrix(combined_text, dtype=dtype)
+        assembler = FeatureAssembler.for_vectorizer(self.tfidf_vectorizer)
+        return assembler.rows(X_text, tail[codes], dtype=dtype)
     
     def calculate_smape(self, y_true, y_pred):
         """Calculate SMAPE (Symmetric Mean Absolute Percentage Error)"""
         return 100 * np.mean(2 * np.abs(y_pred - y_true) / (np.abs(y_pred) + np.abs(y_true)))
     
-    def save_processors(self, tfidf_path, brand_encoder_path):
-        """Save preprocessing objects"""
-        with open(tfidf_path, 'wb') as f:
-            pickle.dump(self.tfidf_vectorizer, f)
+    def save_processors(self, tfidf_path, brand_encoder_path, brand_vocabulary_path=None):
+        """Save preprocessing objects; load_processors with the same paths restores them"""
+        if isinstance(self.tfidf_vectorizer, HashedTfidfVectorizer):
+            self.tfidf_vectorizer.save(tfidf_path)
+        else:
+            with open(tfidf_path, 'wb') as f:
+                pickle.dump(self.tfidf_vectorizer, f)
+        
+        # build_training_matrix encodes brands with the vocabulary, so there is usually no encoder
+        if self.brand_encoder is not None:
+            with open(brand_encoder_path, 'wb') as f:
+                pickle.dump(self.brand_encoder, f)
         
-        with open(brand_encoder_path, 'wb') as f:
-            pickle.dump(self.brand_encoder, f)
+        if brand_vocabulary_path is not None:
+            self.brand_vocabulary.save(brand_vocabulary_path)
     
-    def load_processors(self, tfidf_path, brand_encoder_path):
-        """Load preprocessing objects"""
-        with open(tfidf_path, 'rb') as f:
-            self.tfidf_vectorizer = pickle.load(f)
+    def load_processors(self, tfidf_path, brand_encoder_path, brand_vocabulary_path=None):
+        """Load preprocessing objects saved by save_processors.
+        
+        The brand encoder is optional. Brands are encoded with the saved
+        vocabulary when brand_vocabulary_path is given, else with the
+        encoder's classes if there is one, as the serving predictor does.
+        """
+        if self.text_features == 'hashing':
+            self.tfidf_vectorizer = HashedTfidfVectorizer.load(tfidf_path)
+        else:
+            with open(tfidf_path, 'rb') as f:
+                self.tfidf_vectorizer = pickle.load(f)
         
-        with open(brand_encoder_path, 'rb') as f:
-            self.brand_encoder = pickle.load(f)
+        self.brand_encoder = None
+        if Path(brand_encoder_path).exists():
+            with open(brand_encoder_path, 'rb') as f:
+                self.brand_encoder = pickle.load(f)
+        
+        if brand_vocabulary_path is not None:
+            self.brand_vocabulary = BrandVocabulary.from_file(Path(brand_vocabulary_path))
+        elif self.brand_encoder is not None:
+            self.brand_vocabulary = BrandVocabulary.from_label_encoder(Path(brand_encoder_path))
 
 def load_and_preprocess_data(train_path, test_path=None):
-    """Load and preprocess training and test data"""
+    """Load training (and test) data and build model input in the serving layout.
+    
+    Returns {'processor', 'train_data': {'X', 'df', 'y'}, 'test_data': {'X', 'df'}};
+    X is one float32 CSR matrix from DataProcessor.build_training_matrix and
+    df is the frame as read. This replaces the former X_text/X_brand/
+    X_numerical blocks from prepare_training_data, whose brand encoding and
+    numeric columns did not match what the serving predictor computes.
+    """
     processor = DataProcessor()
     
     # Load data
@@ -118,28 +187,21 @@ def load_and_preprocess_data(train_path, test_path=None):
     else:
         test_df = None
     
-    # Preprocess training data
-    X_text_train, X_brand_train, X_num_train, train_processed = processor.prepare_training_data(train_df)
-    
+    # Build model input in the serving layout
     result = {
         'processor': processor,
         'train_data': {
-            'X_text': X_text_train,
-            'X_brand': X_brand_train,
-            'X_numerical': X_num_train,
-            'df': train_processed,
+            'X': processor.build_training_matrix(train_df),
+            'df': train_df,
             'y': np.log1p(train_df['price'].values) if 'price' in train_df.columns else None
         }
     }
     
-    # Preprocess test data if provided
+    # Test data reuses the fitted vectorizer
     if test_df is not None:
-        X_text_test, X_brand_test, X_num_test, test_processed = processor.prepare_training_data(test_df)
         result['test_data'] = {
-            'X_text': X_text_test,
-            'X_brand': X_brand_test,
-            'X_numerical': X_num_test,
-            'df': test_processed
+            'X': processor.build_training_matrix(test_df),
+            'df': test_df
         }
     
     return result
@@ -0,0 +1,148 @@
+"""
+Streaming bulk repricing: CSV in, test_predictions.csv-format CSV out, in bounded memory
+"""
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from core.predictor import smart_predictor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_ROWS = 10_000
+OUTPUT_COLUMNS = ['sample_id', 'predicted_price']
+
+
+def detect_columns(path: Path) -> Tuple[Optional[str], str, Optional[str]]:
+    """(id column, title column, description column) of a catalog or title/description CSV"""
+    columns = pd.read_csv(path, nrows=0).columns
+    id_column = 'sample_id' if 'sample_id' in columns else None
+    if 'catalog_content' in columns:
+        return id_column, 'catalog_content', None
+    if 'title' in columns:
+        return id_column, 'title', 'description' if 'description' in columns else None
+    raise ValueError(f"{path} has neither a 'catalog_content' nor a 'title' column")
+
+
+def read_chunks(path: Path, chunk_rows: int, columns: List[str]) -> Iterator[pd.DataFrame]:
+    """Only the needed columns, chunk_rows rows at a time"""
+    yield from pd.read_csv(path, usecols=columns, chunksize=chunk_rows, dtype=str, keep_default_na=False)
+
+
+def chunk_inputs(chunks: Iterator[pd.DataFrame], id_column: Optional[str], title_column: str,
+                 description_column: Optional[str]) -> Iterator[Tuple[pd.Series, List[str], List[str]]]:
+    """(ids, titles, descriptions) of each chunk; row numbers stand in for missing ids"""
+    row_offset = 0
+    for chunk in chunks:
+        titles = chunk[title_column].tolist()
+        descriptions = chunk[description_column].tolist() if description_column else [''] * len(titles)
+        ids = chunk[id_column] if id_column else pd.Series(range(row_offset, row_offset + len(chunk)))
+        row_offset += len(chunk)
+        yield ids, titles, descriptions
+
+
+def price_chunk(predictor, titles: List[str], descriptions: List[str]) -> List[float]:
+    """Clean and featurize exactly as /predict does, then one vectorized model pass"""
+    features = [predictor.extract_features(t, d) for t, d in zip(titles, descriptions)]
+    return predictor.predict_price_batch(features)
+
+
+def score(inputs: Iterator[Tuple[pd.Series, List[str], List[str]]], predictor) -> Iterator[pd.DataFrame]:
+    """Score chunks one after another in this process"""
+    for ids, titles, descriptions in inputs:
+        yield pd.DataFrame({'sample_id': ids.to_numpy(), 'predicted_price': price_chunk(predictor, titles, descriptions)})
+
+
+# Process-pool workers: each loads the artifacts once, then prices whole chunks
+
+def _init_worker(model_dir, label, expected_version):
+    # No model in the parent: every worker prices with the same heuristics
+    if expected_version is None:
+        return
+    smart_predictor.load_models(model_dir, label)
+    # load_models logs and swallows failures; a worker on heuristics would mix methods in one output file
+    if smart_predictor.bundle.model is None or smart_predictor.model_version != expected_version:
+        raise RuntimeError(f"Repricing worker {os.getpid()} loaded model version {smart_predictor.model_version}, "
+                           f"expected {expected_version}")
+
+
+def _price_chunk_worker(titles: List[str], descriptions: List[str]) -> List[float]:
+    return price_chunk(smart_predictor, titles, descriptions)
+
+
+def score_parallel(inputs: Iterator[Tuple[pd.Series, List[str], List[str]]], predictor,
+                   workers: int) -> Iterator[pd.DataFrame]:
+    """Score chunks on a process pool and yield them in input order.
+
+    At most two chunks per worker are in flight, so memory stays bounded;
+    results are yielded in submission order, so output is identical to the
+    sequential path. Workers load the predictor's active model version and
+    fail the pool if they end up with any other.
+    """
+    bundle = predictor.bundle
+    loaded = bundle.model is not None
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(bundle.model_dir, bundle.label, bundle.version if loaded else None)
+    ) as executor:
+        pending = deque()
+        for ids, titles, descriptions in inputs:
+            pending.append((ids, executor.submit(_price_chunk_worker, titles, descriptions)))
+            if len(pending) >= 2 * workers:
+                ids, future = pending.popleft()
+                yield pd.DataFrame({'sample_id': ids.to_numpy(), 'predicted_price': future.result()})
+        while pending:
+            ids, future = pending.popleft()
+            yield pd.DataFrame({'sample_id': ids.to_numpy(), 'predicted_price': future.result()})
+
+
+def reprice_csv(input_path, output_path, predictor, chunk_rows: int = DEFAULT_CHUNK_ROWS, workers: int = 1) -> Dict:
+    """Score every row of input_path and write sample_id,predicted_price rows to output_path.
+
+    Each stage is a generator, so only a bounded number of chunks is in
+    memory at a time whatever the input size. With workers > 1 chunks are
+    scored on a process pool and written back in input order. Output goes
+    to a temporary file that replaces output_path only once every row is
+    written.
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    id_column, title_column, description_column = detect_columns(input_path)
+    columns = [c for c in (id_column, title_column, description_column) if c]
+
+    start = time.time()
+    rows = 0
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    try:
+        with open(tmp_path, 'w', newline='') as out:
+            pd.DataFrame(columns=OUTPUT_COLUMNS).to_csv(out, index=False)
+            inputs = chunk_inputs(read_chunks(input_path, chunk_rows, columns), id_column, title_column, description_column)
+            scored = score_parallel(inputs, predictor, workers) if workers > 1 else score(inputs, predictor)
+            for predictions in scored:
+                predictions.to_csv(out, header=False, index=False)
+                rows += len(predictions)
+                logger.info(f"💾 Repriced {rows:,} rows ({rows / max(time.time() - start, 1e-9):,.0f} rows/s)")
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    elapsed = time.time() - start
+    return {
+        'input': str(input_path),
+        'output': str(output_path),
+        'rows': rows,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(rows / elapsed, 1) if elapsed else None,
+        'workers': workers,
+        'model_version': predictor.model_version,
+        'prediction_method': 'ML Model' if predictor.model_loaded else 'Advanced Heuristics'
+    }
@@ -0,0 +1,73 @@
+"""
+Product text normalization shared by training, serving and offline scoring
+"""
+import re
+import string
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+
+# ASCII letters, digits and whitespace survive; every other byte becomes a space
+_KEEP = set(string.ascii_letters + string.digits) | {c for c in map(chr, range(128)) if c.isspace()}
+_ASCII_TABLE = bytes(i if chr(i) in _KEEP else ord(' ') for i in range(256))
+_NON_ALNUM = re.compile(r'[^a-zA-Z0-9\s]')
+
+# Below this many distinct strings, process start-up costs more than it saves
+PARALLEL_MIN_UNIQUE = 200_000
+
+
+def _normalize(text: str) -> str:
+    text = text.lower()
+    if text.isascii():
+        text = text.encode('ascii').translate(_ASCII_TABLE).decode('ascii')
+    else:
+        text = _NON_ALNUM.sub(' ', text)
+    # split() breaks on the same whitespace as \s, so this equals re.sub(r'\s+', ' ', text).strip()
+    return ' '.join(text.split())
+
+
+def normalize_text(text) -> str:
+    """Lowercase, replace non-alphanumerics with spaces, collapse whitespace; NaN -> ''"""
+    if not isinstance(text, str):
+        if pd.isna(text):
+            return ""
+        text = str(text)
+    return _normalize(text)
+
+
+def _normalize_list(texts: List) -> List[str]:
+    return [normalize_text(t) for t in texts]
+
+
+def normalize_texts(texts: Iterable, workers: int = 1) -> np.ndarray:
+    """Normalize many values, cleaning each distinct string only once.
+
+    Returns an object array aligned with the input. With workers > 1 and
+    at least PARALLEL_MIN_UNIQUE distinct strings, the distinct strings are
+    split across a process pool.
+    """
+    if not isinstance(texts, pd.Series):
+        texts = pd.Series(list(texts), dtype=object)
+    codes, uniques = pd.factorize(texts)
+    uniques = list(uniques)
+
+    if workers > 1 and len(uniques) >= PARALLEL_MIN_UNIQUE:
+        size = -(-len(uniques) // workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = executor.map(_normalize_list, [uniques[i:i + size] for i in range(0, len(uniques), size)])
+            cleaned = [text for part in parts for text in part]
+    else:
+        cleaned = _normalize_list(uniques)
+
+    # Missing values get code -1, which picks the trailing ''
+    lookup = np.empty(len(cleaned) + 1, dtype=object)
+    lookup[:len(cleaned)] = cleaned
+    lookup[-1] = ""
+    return lookup[codes]
+
+
+def normalize_series(series: pd.Series, workers: int = 1) -> pd.Series:
+    """normalize_texts for a Series, keeping its index"""
+    return pd.Series(normalize_texts(series, workers=workers), index=series.index, dtype=object)
@@ -8,7 +8,10 @@ import logging.config
 
 from config.settings import *
 from services.model_service import model_service
+from services.inference_pool import InferenceQueueFull
+from services.data_service import real_data_service
 from routes.analytics import router as analytics_router
+from routes.prediction import router as prediction_router
 
 # Configure logging
 logging.config.dictConfig(LOGGING_CONFIG)
@@ -20,9 +23,12 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info(f"🚀 Starting {API_TITLE}...")
     await model_service.initialize_models()
+    # Analytics dataset loads in the background; /health reports progress
+    real_data_service.start_background_load()
     yield
     # Shutdown
     logger.info("🛑 Shutting down application...")
+    await model_service.shutdown()
 
 # Create FastAPI app
 app = FastAPI(
@@ -41,8 +47,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include analytics router
+# Include API routers
 app.include_router(analytics_router)
+app.include_router(prediction_router)
 
 @app.get("/")
 async def root():
@@ -57,7 +64,9 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check with model status"""
-    return await model_service.health_check()
+    health = await model_service.health_check()
+    health["analytics_data"] = real_data_service.get_load_status()
+    return health
 
 # ML Model prediction using PKL files
 @app.post("/predict")
@@ -79,6 +88,9 @@ async def ml_predict(request: dict):
             'response_time': result['response_time']
         }
         
+    except InferenceQueueFull as e:
+        # Shed load quickly instead of queueing behind a saturated pool
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         logger.error(f"ML prediction failed: {e}")
         # Fallback only if ML fails
@@ -96,7 +108,7 @@ async def ml_predict(request: dict):
 
 @app.get("/model-stats")
 async def model_stats():
-    return model_service.predictor.get_model_stats()
+    return model_service.get_model_stats()
 
 @app.get("/analytics")
 async def analytics():
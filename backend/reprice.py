@@ -0,0 +1,50 @@
+"""
+Reprice a product CSV in bounded memory
+
+Usage:
+    python reprice.py <input.csv> <output.csv> [--chunk-rows N] [--workers N] [--model-version NAME]
+
+The input is either test.csv-style (sample_id, catalog_content) or has
+title/description columns. Output is in test_predictions.csv format
+(sample_id, predicted_price). The output path is required so a run never
+overwrites models/test_predictions.csv, which the analytics dashboard reads.
+--workers spreads chunks over a process pool (0 = one per core); rows keep
+their input order.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+from core.predictor import smart_predictor
+from core.repricing import DEFAULT_CHUNK_ROWS, reprice_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a product CSV chunk by chunk")
+    parser.add_argument("input", type=Path)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--workers", type=int, default=1, help="scoring processes (0 = one per core)")
+    parser.add_argument("--model-version", help="version directory under MODEL_VERSIONS_DIR (default: MODEL_DIR)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    if args.model_version:
+        loaded = smart_predictor.load_models(smart_predictor.version_dir(args.model_version), args.model_version)
+    else:
+        loaded = smart_predictor.load_models()
+    if not loaded:
+        print("⚠️ Model artifacts not found, repricing with heuristics", file=sys.stderr)
+
+    workers = args.workers or os.cpu_count() or 1
+    result = reprice_csv(args.input, args.output, smart_predictor, chunk_rows=args.chunk_rows, workers=workers)
+    print(f"✅ Repriced {result['rows']:,} rows in {result['seconds']}s → {result['output']}")
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,5 +2,6 @@
 API Routes Package
 """
 from .analytics import router as analytics_router
+from .prediction import router as prediction_router
 
-__all__ = ["analytics_router"]
\ No newline at end of file
+__all__ = ["analytics_router", "prediction_router"]
\ No newline at end of file
@@ -2,6 +2,7 @@
 Advanced Analytics API Routes with Real-time Monitoring
 """
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
 from services.model_service import model_service
 from services.data_service import real_data_service
 from datetime import datetime, timedelta
@@ -10,9 +11,24 @@ import logging
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1", tags=["analytics"])
 
+def _warming_response():
+    """503 response reported while the analytics dataset is still loading"""
+    return JSONResponse(
+        status_code=503,
+        content={
+            "status": "warming",
+            "detail": "Analytics dataset is still loading",
+            "progress": real_data_service.get_load_status()
+        },
+        headers={"Retry-After": "5"}
+    )
+
 @router.get("/analytics/dashboard")
 async def get_dashboard_data():
     """Get comprehensive dashboard analytics using real data"""
+    if real_data_service.is_warming:
+        return _warming_response()
+    
     try:
         real_analytics = real_data_service.get_dashboard_analytics()
         system_metrics = model_service.get_analytics_data()
@@ -44,9 +60,11 @@ async def get_model_stats():
 @router.get("/analytics/feature-importance")
 async def get_feature_importance():
     """Get feature importance data for charts from real data"""
+    if real_data_service.is_warming:
+        return _warming_response()
+    
     try:
-        real_analytics = real_data_service.get_dashboard_analytics()
-        feature_importance = real_analytics.get('feature_importance', [])
+        feature_importance = real_data_service.get_feature_importance()
         
         if not feature_importance:
             return model_service.predictor.get_feature_importance()
@@ -64,8 +82,7 @@ async def get_feature_importance():
 async def get_performance_data():
     """Get model performance comparison data from real data"""
     try:
-        real_analytics = real_data_service.get_dashboard_analytics()
-        performance_data = real_analytics.get('model_performance', [])
+        performance_data = real_data_service.get_model_performance()
         
         if not performance_data:
             performance_data = model_service.predictor.get_performance_data()
@@ -81,8 +98,14 @@ async def get_real_time_metrics():
     """Get real-time system performance metrics"""
     try:
         metrics = model_service.performance_metrics
+        live = model_service.live_stats.snapshot()
         return {
             "current_metrics": metrics,
+            "latency": live['latency_seconds'],
+            "predicted_price": live['predicted_price'],
+            "throughput": live['throughput'],
+            "per_minute": live['per_minute'],
+            "micro_batching": model_service.micro_batcher.get_stats(),
             "cache_performance": {
                 "size": len(model_service.prediction_cache),
                 "hit_rate": round(metrics['cache_hits'] / max(1, metrics['total_predictions']) * 100, 2),
@@ -91,7 +114,7 @@ async def get_real_time_metrics():
             "system_health": {
                 "status": "optimal" if metrics['error_count'] < 5 else "warning",
                 "uptime": str(datetime.now() - metrics['last_updated']),
-                "predictions_per_minute": round(metrics['total_predictions'] / max(1, (datetime.now() - metrics['last_updated']).total_seconds() / 60), 2)
+                "predictions_per_minute": live['throughput']['avg_per_minute']
             }
         }
     except Exception as e:
@@ -101,11 +124,14 @@ async def get_real_time_metrics():
 @router.get("/analytics/prediction-history")
 async def get_prediction_history(limit: int = 20):
     """Get recent prediction history from real data"""
+    if real_data_service.is_warming:
+        return _warming_response()
+    
     try:
         real_history = real_data_service.get_prediction_history(limit)
         
         if not real_history:
-            history = model_service.prediction_history[-limit:]
+            history = list(model_service.prediction_history)[-limit:]
             return {
                 "predictions": history,
                 "total_count": len(model_service.prediction_history),
@@ -161,7 +187,8 @@ async def get_model_info():
                 "Real-time analytics"
             ]
         },
-        "current_status": status
+        "current_status": status,
+        "analytics_data": real_data_service.get_load_status()
     }
 
 
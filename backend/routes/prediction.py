@@ -0,0 +1,79 @@
+"""
+Prediction API Routes
+"""
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from services.model_service import ModelReloadInProgress, model_service
+from services.inference_pool import InferenceQueueFull
+from core.predictor import ModelValidationError
+from config.settings import ADMIN_TOKEN, ML_CONFIG
+from typing import Optional
+import hmac
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/v1", tags=["prediction"])
+
+LOOPBACK_HOSTS = ('127.0.0.1', '::1', 'localhost')
+
+def require_admin(request: Request, x_admin_token: Optional[str] = Header(None)):
+    """Admin access: the X-Admin-Token header must match ADMIN_TOKEN; with no token configured, loopback clients only"""
+    if ADMIN_TOKEN:
+        if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+            raise HTTPException(status_code=401, detail="Missing or invalid admin token")
+    elif request.client is None or request.client.host not in LOOPBACK_HOSTS:
+        raise HTTPException(status_code=403, detail="Set ADMIN_TOKEN to use admin endpoints from other hosts")
+
+@router.post("/predict/batch")
+async def predict_batch(request: dict):
+    """Batch prediction: one vectorized TF-IDF + model pass for all products"""
+    products = request.get('products')
+    if not isinstance(products, list) or not all(isinstance(p, dict) for p in products):
+        raise HTTPException(status_code=422, detail="'products' must be a list of {title, description} objects")
+    
+    max_batch_size = ML_CONFIG['max_batch_size']
+    if len(products) > max_batch_size:
+        raise HTTPException(status_code=413, detail=f"Batch too large: {len(products)} products (max {max_batch_size})")
+    
+    try:
+        result = await model_service.predict_batch_with_monitoring(products)
+        
+        # Same per-item format as /predict
+        return {
+            'predictions': [
+                {
+                    'predicted_price': p['predicted_price'],
+                    'confidence': p['confidence_score'],
+                    'key_features': p['key_features'],
+                    'prediction_method': result['model_used']
+                }
+                for p in result['predictions']
+            ],
+            'count': result['count'],
+            'prediction_method': result['model_used'],
+            'response_time': result['response_time']
+        }
+        
+    except InferenceQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except Exception as e:
+        logger.error(f"Batch prediction error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/model/reload", dependencies=[Depends(require_admin)])
+async def reload_model(request: dict):
+    """Hot-swap to a model version from MODEL_VERSIONS_DIR without a restart"""
+    version = request.get('version')
+    if not isinstance(version, str) or not version:
+        raise HTTPException(status_code=422, detail="'version' must name a directory in the model versions folder")
+    
+    try:
+        return await model_service.reload_model(version)
+    except ModelReloadInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (ModelValidationError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Model reload error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,184 @@
+"""
+Pre-fork server: load the models once, then fork workers that share them
+
+Usage:
+    python serve_prefork.py [--workers N] [--host HOST] [--port PORT] [--no-preload]
+
+The master process loads the model artifacts before forking and freezes the
+garbage collector, so every worker inherits them as copy-on-write pages
+instead of unpickling its own copy. Workers serve main:app on one shared
+listening socket; when their startup calls load_models() again, the
+artifact registry hands back the inherited objects. The master restarts
+workers that exit, waiting exponentially longer after each worker that dies
+within MIN_WORKER_UPTIME seconds, and shuts down after MAX_FAST_FAILURES
+such deaths in a row (a worker that cannot import or bind would otherwise
+be re-forked in a tight loop). It stops all workers on SIGINT/SIGTERM.
+
+--no-preload forks first and lets every worker load its own copy, which is
+what separate uvicorn workers do; it is the baseline for
+benchmarks/bench_prefork_memory.py.
+
+Model reloads (POST /api/v1/model/reload) only affect the worker that
+serves the request; restart the server to switch every worker.
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from config.settings import HOST, LOG_LEVEL, PORT
+# Imported (and logging configured) before forking in both modes, so library code is always shared
+from main import app
+
+logger = logging.getLogger("serve_prefork")
+
+# A worker that exits sooner than this after forking counts as a failed start
+MIN_WORKER_UPTIME = 10.0
+# Restart delay after a failed start: doubles with each consecutive one, up to the max
+RESTART_BASE_DELAY = 0.5
+RESTART_MAX_DELAY = 30.0
+# Consecutive failed starts after which the master gives up
+MAX_FAST_FAILURES = 5
+
+
+class WorkerServer(uvicorn.Server):
+    """uvicorn server that logs how long the worker took to become ready"""
+
+    def __init__(self, config, forked_at):
+        super().__init__(config)
+        self.forked_at = forked_at
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets=sockets)
+        logger.info(f"👷 Worker {os.getpid()} ready in {time.perf_counter() - self.forked_at:.3f}s")
+
+
+def preload_models():
+    """Load model artifacts in the master and keep them out of GC passes"""
+    from services.model_service import model_service
+
+    # No collections while loading, so long-lived objects are not moved around first
+    gc.disable()
+    start = time.perf_counter()
+    model_service.load_models()
+    logger.info(f"📦 Models preloaded in {time.perf_counter() - start:.3f}s (version {model_service.predictor.model_version})")
+
+    # Objects that exist now go to the permanent generation: collections in the
+    # workers never write to their headers, so their pages stay shared
+    gc.freeze()
+    gc.enable()
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock: socket.socket, log_level: str):
+    forked_at = time.perf_counter()
+    # uvicorn installs its own SIGINT/SIGTERM handlers for graceful shutdown
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    config = uvicorn.Config(app, log_level=log_level)
+    WorkerServer(config, forked_at).run(sockets=[sock])
+
+
+def spawn_worker(sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_worker(sock, log_level)
+        except BaseException:
+            logger.exception(f"❌ Worker {os.getpid()} crashed")
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the API from pre-forked workers that share loaded models")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--no-preload", action="store_true", help="let each worker load its own models")
+    args = parser.parse_args()
+
+    if not args.no_preload:
+        preload_models()
+
+    sock = bind_socket(args.host, args.port)
+    # pid -> fork time, to tell crash loops from workers that ran for a while
+    workers = {}
+    for _ in range(args.workers):
+        workers[spawn_worker(sock, LOG_LEVEL)] = time.monotonic()
+    logger.info(f"🚀 Master {os.getpid()} serving on {args.host}:{args.port} with {len(workers)} workers "
+                f"({'no preload' if args.no_preload else 'shared models'})")
+
+    stopping = False
+    fast_failures = 0
+    exit_code = 0
+
+    def stop_workers():
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        stop_workers()
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        started_at = workers.pop(pid, None)
+        if stopping or started_at is None:
+            continue
+
+        uptime = time.monotonic() - started_at
+        fast_failures = fast_failures + 1 if uptime < MIN_WORKER_UPTIME else 0
+        if fast_failures >= MAX_FAST_FAILURES:
+            logger.error(f"❌ {fast_failures} workers in a row exited within {MIN_WORKER_UPTIME:.0f}s, shutting down")
+            stopping = True
+            exit_code = 1
+            stop_workers()
+            continue
+
+        delay = min(RESTART_MAX_DELAY, RESTART_BASE_DELAY * 2 ** (fast_failures - 1)) if fast_failures else 0.0
+        logger.warning(f"⚠️ Worker {pid} exited with status {status} after {uptime:.1f}s, restarting in {delay:.1f}s")
+        # Short sleeps, so a SIGTERM during the delay is acted on promptly
+        deadline = time.monotonic() + delay
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(0.1)
+        if not stopping:
+            workers[spawn_worker(sock, LOG_LEVEL)] = time.monotonic()
+
+    sock.close()
+    logger.info("🛑 All workers stopped")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
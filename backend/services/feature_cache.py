@@ -0,0 +1,126 @@
+"""
+Persisted columnar cache for processed analytics data
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever extracted feature values change (2: whole-word keyword matching)
+CACHE_FORMAT_VERSION = 2
+
+# Bytes hashed from the start, middle and end of each source file
+DIGEST_SAMPLE_BYTES = 1 << 20
+
+
+def file_fingerprint(path: Path) -> Dict:
+    """Size, mtime and a sampled content digest of a source file.
+
+    The digest covers the first, middle and last megabyte plus the file
+    size, so it stays cheap for multi-gigabyte CSVs while still catching
+    files rewritten in place with a preserved mtime.
+    """
+    stat = path.stat()
+    digest = hashlib.blake2b(str(stat.st_size).encode(), digest_size=16)
+    with open(path, 'rb') as f:
+        for offset in (0, stat.st_size // 2, max(0, stat.st_size - DIGEST_SAMPLE_BYTES)):
+            f.seek(offset)
+            digest.update(f.read(DIGEST_SAMPLE_BYTES))
+    return {
+        'path': str(path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'digest': digest.hexdigest()
+    }
+
+
+class FeatureCache:
+    """Stores a processed frame as one memory-mappable .npy file per column.
+
+    Each entry lives in a directory named after the fingerprint of its
+    source files; the manifest is written last, so an entry without one is
+    incomplete and ignored. Loaded columns are read-only memory maps, which
+    lets several worker processes share one page-cached copy.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def key_for(self, sources: List[Path]) -> Dict:
+        """Fingerprint the given source files"""
+        fingerprints = [file_fingerprint(path) for path in sources]
+        blob = json.dumps([CACHE_FORMAT_VERSION, fingerprints], sort_keys=True).encode()
+        return {
+            'key': hashlib.blake2b(blob, digest_size=16).hexdigest(),
+            'sources': fingerprints
+        }
+
+    def load(self, key: Dict) -> Optional[pd.DataFrame]:
+        """Memory-map a cached frame, or return None on a miss"""
+        entry_dir = self.cache_dir / key['key']
+        manifest_path = entry_dir / 'manifest.json'
+        if not manifest_path.exists():
+            return None
+
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('format_version') != CACHE_FORMAT_VERSION or manifest.get('sources') != key['sources']:
+                return None
+
+            columns = {
+                name: np.load(entry_dir / f"{name}.npy", mmap_mode='r')
+                for name in manifest['columns']
+            }
+            return pd.DataFrame(columns, copy=False)
+
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable feature cache {entry_dir}: {e}")
+            return None
+
+    def save(self, key: Dict, frame: pd.DataFrame):
+        """Write a frame under the given key and drop entries for older sources"""
+        entry_dir = self.cache_dir / key['key']
+        tmp_dir = self.cache_dir / f".{key['key']}.tmp-{os.getpid()}"
+
+        try:
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            columns = {}
+            for name in frame.columns:
+                values = frame[name].to_numpy()
+                if values.dtype == object:
+                    values = pd.to_numeric(frame[name], errors='coerce').to_numpy(dtype=np.float64)
+                np.save(tmp_dir / f"{name}.npy", np.ascontiguousarray(values))
+                columns[name] = str(values.dtype)
+
+            with open(tmp_dir / 'manifest.json', 'w') as f:
+                json.dump({
+                    'format_version': CACHE_FORMAT_VERSION,
+                    'sources': key['sources'],
+                    'columns': columns,
+                    'rows': len(frame)
+                }, f, indent=2)
+
+            try:
+                tmp_dir.rename(entry_dir)
+            except OSError:
+                # Another worker stored the same entry first
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+            for stale in self.cache_dir.iterdir():
+                if stale.is_dir() and stale.name != key['key'] and not stale.name.startswith('.'):
+                    shutil.rmtree(stale, ignore_errors=True)
+
+            logger.info(f"💾 Feature cache written to {entry_dir}")
+
+        except Exception as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            logger.warning(f"⚠️ Feature cache write failed: {e}")
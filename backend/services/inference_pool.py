@@ -0,0 +1,213 @@
+"""
+Worker pool that keeps CPU-bound inference off the asyncio event loop
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from core.predictor import WARMUP_DESCRIPTION, WARMUP_TITLE, smart_predictor
+
+logger = logging.getLogger(__name__)
+
+# How long a new process pool may take to bring every worker up on a reload
+WARMUP_TIMEOUT_SECONDS = 120
+
+
+class InferenceQueueFull(Exception):
+    """Raised when the pool already holds its maximum number of requests"""
+
+    def __init__(self, in_flight: int, retry_after: int):
+        super().__init__(f"Inference queue full ({in_flight} requests in flight)")
+        self.in_flight = in_flight
+        self.retry_after = retry_after
+
+
+# Worker-side entry points. Thread workers share the process-wide predictor;
+# process workers load their own copy once in _init_worker.
+
+# Barrier across every worker of one process pool, set by _init_worker
+_worker_barrier = None
+
+
+def _init_worker(model_dir=None, label=None, barrier=None):
+    global _worker_barrier
+    _worker_barrier = barrier
+    if label is None:
+        smart_predictor.load_models()
+    else:
+        smart_predictor.load_models(model_dir, label)
+
+
+def _warm_up_worker() -> Tuple[int, str]:
+    """Score the warm-up product and report (pid, model version).
+
+    Waits on the pool barrier first, so one call per worker runs on every
+    worker rather than on whichever worker is free.
+    """
+    _worker_barrier.wait(timeout=WARMUP_TIMEOUT_SECONDS)
+    smart_predictor.predict(WARMUP_TITLE, WARMUP_DESCRIPTION)
+    return os.getpid(), smart_predictor.model_version
+
+
+def _score_features(features) -> Dict:
+    return smart_predictor.predict_from_features(features)
+
+
+def _score_batch(titles: List[str], descriptions: List[str]) -> List[Dict]:
+    return smart_predictor.predict_batch(titles, descriptions)
+
+
+def _score_features_batch(features: List) -> List[Dict]:
+    return smart_predictor.predict_batch_from_features(features)
+
+
+class InferencePool:
+    """Bounded thread or process pool for model scoring.
+
+    At most `max_workers + max_queue` requests are admitted at once; beyond
+    that, calls fail immediately with InferenceQueueFull instead of queueing
+    without limit, so callers can shed load while the event loop keeps
+    serving health checks and analytics.
+    """
+
+    EXECUTORS = ('thread', 'process')
+
+    def __init__(self, executor: str = 'thread', max_workers: Optional[int] = None,
+                 max_queue: int = 64, retry_after_seconds: int = 1):
+        if executor not in self.EXECUTORS:
+            logger.warning(f"⚠️ Unknown inference executor '{executor}', using threads")
+            executor = 'thread'
+        self.executor_type = executor
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_queue = max_queue
+        self.retry_after_seconds = retry_after_seconds
+
+        self._executor: Optional[Executor] = None
+        # Model directory process workers load; None means the default artifacts
+        self.model_dir = None
+        self.model_label = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def start(self):
+        """Create the executor; process workers load the models in their initializer"""
+        if self._executor is not None:
+            return
+        self._executor = self._create_executor(self.model_dir, self.model_label)
+        logger.info(f"⚙️ Inference pool started ({self.max_workers} {self.executor_type} workers, queue {self.max_queue})")
+
+    def _create_executor(self, model_dir=None, label=None) -> Executor:
+        if self.executor_type == 'process':
+            # spawn avoids forking a parent that already runs loader threads
+            context = multiprocessing.get_context('spawn')
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(model_dir, label, context.Barrier(self.max_workers))
+            )
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='inference')
+
+    def use_model(self, model_dir, label: str, expected_version: str):
+        """Point process workers at another model version.
+
+        A new set of workers loads the version, and every one of them scores
+        the warm-up product and reports its version before the set replaces
+        the old one; requests already running on the old workers finish
+        there. Thread workers share the predictor and need nothing.
+        Blocking; call it off the event loop.
+        """
+        if self.executor_type != 'process' or self._executor is None:
+            self.model_dir, self.model_label = model_dir, label
+            return
+
+        executor = self._create_executor(model_dir, label)
+        try:
+            # Submit everything before waiting: the barrier holds each call until all workers have one
+            futures = [executor.submit(_warm_up_worker) for _ in range(self.max_workers)]
+            replies = [future.result(timeout=WARMUP_TIMEOUT_SECONDS) for future in futures]
+            pids = {pid for pid, _ in replies}
+            versions = {version for _, version in replies}
+            if len(pids) != self.max_workers:
+                raise RuntimeError(f"Only {len(pids)} of {self.max_workers} workers answered the warm-up")
+            if versions != {expected_version}:
+                raise RuntimeError(f"Workers loaded model version(s) {sorted(versions)}, expected {expected_version}")
+        except Exception:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+        previous, self._executor = self._executor, executor
+        self.model_dir, self.model_label = model_dir, label
+        previous.shutdown(wait=False)
+        logger.info(f"⚙️ Inference workers now serve model version {expected_version}")
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, fn, *args):
+        if self._executor is None:
+            self.start()
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise InferenceQueueFull(self.in_flight, self.retry_after_seconds)
+
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, fn, *args)
+            self.completed += 1
+            return result
+        finally:
+            self.in_flight -= 1
+
+    async def predict(self, features) -> Dict:
+        """Score one request's extracted features on a worker"""
+        return await self._run(_score_features, features)
+
+    async def predict_batch(self, titles: List[str], descriptions: List[str]) -> List[Dict]:
+        """Score a batch with one vectorized pass on a worker"""
+        return await self._run(_score_batch, titles, descriptions)
+
+    async def predict_features_batch(self, features: List) -> List[Dict]:
+        """Score already extracted feature sets in one vectorized pass"""
+        return await self._run(_score_features_batch, features)
+
+    def workers_alive(self) -> bool:
+        """Whether the pool can still run work, checked without submitting any.
+
+        False once the executor is shut down or broken, or when one of the
+        worker processes it started has died. Worker processes start on
+        demand, so a pool that has not scored anything yet counts as alive.
+        """
+        executor = self._executor
+        if executor is None or getattr(executor, '_broken', False):
+            return False
+        if isinstance(executor, ProcessPoolExecutor):
+            processes = list((executor._processes or {}).values())
+            return all(process.is_alive() for process in processes)
+        return True
+
+    def stats(self) -> Dict:
+        return {
+            'executor': self.executor_type,
+            'running': self._executor is not None,
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'in_flight': self.in_flight,
+            'saturated': self.in_flight >= self.capacity,
+            'peak_in_flight': self.peak_in_flight,
+            'completed': self.completed,
+            'rejected': self.rejected
+        }
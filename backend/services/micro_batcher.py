@@ -0,0 +1,194 @@
+"""
+Micro-batching scheduler that groups concurrent single predictions
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from services.inference_pool import InferencePool, InferenceQueueFull
+from services.streaming_stats import QuantileSketch, RunningMoments
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingStats:
+    """Batch-size and queue-wait distributions for tuning the batching window"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.batches = 0
+            self.items = 0
+            self.full_batches = 0
+            self.rejected = 0
+            self.batch_size = RunningMoments()
+            self.batch_size_sketch = QuantileSketch()
+            self.queue_wait = RunningMoments()
+            self.queue_wait_sketch = QuantileSketch()
+            self.batch_latency = RunningMoments()
+
+    def record_batch(self, size: int, full: bool, waits: List[float], latency: float):
+        with self._lock:
+            self.batches += 1
+            self.items += size
+            self.full_batches += int(full)
+            self.batch_size.update(size)
+            self.batch_size_sketch.add(size)
+            for wait in waits:
+                self.queue_wait.update(wait)
+                self.queue_wait_sketch.add(wait)
+            self.batch_latency.update(latency)
+
+    def record_rejection(self):
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'batches': self.batches,
+                'items': self.items,
+                'full_batches': self.full_batches,
+                'rejected': self.rejected,
+                'batch_size': {**self.batch_size.to_dict(2), **self.batch_size_sketch.quantiles(digits=1)},
+                'queue_wait_seconds': {**self.queue_wait.to_dict(6), **self.queue_wait_sketch.quantiles(digits=6)},
+                'batch_latency_seconds': self.batch_latency.to_dict(6)
+            }
+
+
+class MicroBatcher:
+    """Collects single-item requests and scores them together.
+
+    A batch is dispatched once it holds `max_batch_size` requests or the
+    oldest request has waited `max_wait_ms`. The window only applies while
+    other batches are being scored; on an idle pool requests are sent
+    straight away. Requests that pile up while every worker is busy are
+    drained without waiting, so batches grow with load.
+    """
+
+    def __init__(self, pool: InferencePool, max_batch_size: int = 32, max_wait_ms: float = 5.0,
+                 max_queue: int = 1024):
+        self.pool = pool
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.max_queue = max_queue
+        self.stats = BatchingStats()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+        self._batches = set()
+        self._scoring = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the collector task on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        # One batch per worker; later requests gather into the next batch
+        self._slots = asyncio.Semaphore(self.pool.max_workers)
+        self._task = asyncio.get_running_loop().create_task(self._collect())
+        logger.info(f"📦 Micro-batching started (max batch {self.max_batch_size}, window {self.max_wait * 1000:g} ms)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+        # Anything still queued will never be scored
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped"))
+
+    async def submit(self, features) -> Dict:
+        """Queue one request's features and wait for its prediction"""
+        if not self.running:
+            self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((features, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.stats.record_rejection()
+            raise InferenceQueueFull(self._queue.qsize(), self.pool.retry_after_seconds)
+        return await future
+
+    async def _collect(self):
+        while True:
+            await self._slots.acquire()
+            try:
+                batch = [await self._queue.get()]
+                # With every worker idle there is nothing to batch against, so a
+                # lone request goes out at once; the window only applies under load
+                deadline = batch[0][2] + (self.max_wait if self._scoring else 0.0)
+
+                while len(batch) < self.max_batch_size:
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            except BaseException:
+                self._slots.release()
+                raise
+
+            self._scoring += 1
+            task = asyncio.get_running_loop().create_task(self._score(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _score(self, batch):
+        try:
+            # Requests whose callers went away are not scored
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                return
+
+            dispatched = time.perf_counter()
+            waits = [dispatched - enqueued for _, _, enqueued in batch]
+            try:
+                results = await self.pool.predict_features_batch([features for features, _, _ in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            self.stats.record_batch(len(batch), len(batch) >= self.max_batch_size, waits,
+                                    time.perf_counter() - dispatched)
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._scoring -= 1
+            self._slots.release()
+
+    def get_stats(self) -> Dict:
+        return {
+            'running': self.running,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            **self.stats.snapshot()
+        }
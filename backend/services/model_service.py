@@ -4,22 +4,41 @@ Advanced Model Management Service
 import logging
 import time
 import asyncio
+import threading
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from core.predictor import smart_predictor
 from core.processor import DataProcessor
+from core.artifacts import artifact_registry, load_pickle
+from services.streaming_stats import PredictionStats
+from services.prediction_cache import create_prediction_cache, prediction_cache_key
+from services.inference_pool import InferencePool, InferenceQueueFull
+from services.micro_batcher import MicroBatcher
+from config.settings import BATCHING_CONFIG, CACHE_CONFIG, INFERENCE_CONFIG, ML_CONFIG
 import pandas as pd
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+class ModelReloadInProgress(Exception):
+    """Raised when a reload is requested while another one is still running"""
+
 class ModelService:
     """Advanced service for managing ML models with monitoring and analytics"""
     
     def __init__(self):
         self.predictor = smart_predictor
-        self.processor = DataProcessor()
-        self.prediction_cache = {}
+        self.processor = DataProcessor(text_features=ML_CONFIG['text_features'])
+        self.prediction_cache = create_prediction_cache(CACHE_CONFIG)
+        self.inference_pool = InferencePool(**INFERENCE_CONFIG)
+        self.batching_enabled = BATCHING_CONFIG['enabled']
+        self.micro_batcher = MicroBatcher(
+            self.inference_pool,
+            max_batch_size=BATCHING_CONFIG['max_batch_size'],
+            max_wait_ms=BATCHING_CONFIG['max_wait_ms'],
+            max_queue=BATCHING_CONFIG['max_queue']
+        )
         self.performance_metrics = {
             'total_predictions': 0,
             'avg_response_time': 0,
@@ -27,27 +46,26 @@ class ModelService:
             'error_count': 0,
             'last_updated': datetime.now()
         }
-        self.prediction_history = []
+        self.prediction_history = deque(maxlen=50)
+        self.live_stats = PredictionStats()
+        self.reload_history = deque(maxlen=10)
+        self._reload_lock = asyncio.Lock()
+        # Held while the active model and the cache's bound version change together
+        self._swap_lock = threading.Lock()
     
     async def initialize_models(self):
         """Initialize and load ML models with processor integration"""
         logger.info("🚀 Initializing AmazeWorth Smart Price Engine...")
         
-        # Load ML models
-        model_success = self.predictor.load_models()
+        model_success = self.load_models()
         
-        # Initialize data processor
-        try:
-            model_dir = Path(__file__).parent.parent / 'models'
-            tfidf_path = model_dir / 'tfidf_vectorizer.pkl'
-            
-            if tfidf_path.exists():
-                import pickle
-                with open(str(tfidf_path), 'rb') as f:
-                    self.processor.tfidf_vectorizer = pickle.load(f)
-                logger.info("✅ Data processor TF-IDF loaded successfully")
-        except Exception as e:
-            logger.warning(f"⚠️ Processor loading failed: {e}")
+        # Cached predictions from other artifacts are no longer valid
+        self.prediction_cache.bind_version(self.predictor.model_version)
+        
+        # Scoring runs on the worker pool, off the event loop
+        self.inference_pool.start()
+        if self.batching_enabled:
+            self.micro_batcher.start()
         
         if model_success:
             logger.info("✅ ML Models loaded successfully")
@@ -56,25 +74,137 @@ class ModelService:
             logger.warning("⚠️ Using fallback prediction method")
             return False
     
+    def load_models(self):
+        """Load the startup model and share it with the processor; starts no threads"""
+        # Load ML models (a named version directory if MODEL_VERSION is set)
+        version = ML_CONFIG['model_version']
+        if version:
+            try:
+                model_dir = self.predictor.version_dir(version)
+                model_success = self.predictor.load_models(model_dir, version)
+                self.inference_pool.model_dir, self.inference_pool.model_label = model_dir, version
+            except (ValueError, FileNotFoundError) as e:
+                logger.error(f"❌ {e}")
+                model_success = False
+        else:
+            model_success = self.predictor.load_models()
+        
+        self._share_processor_artifacts()
+        return model_success
+    
+    def _share_processor_artifacts(self):
+        """Point the data processor at the active model's artifacts (shared, read-only)"""
+        try:
+            model_dir = Path(__file__).parent.parent / 'models'
+            tfidf_path = model_dir / ML_CONFIG['vectorizer_file']
+            
+            if self.predictor.tfidf_vectorizer is not None:
+                self.processor.tfidf_vectorizer = self.predictor.tfidf_vectorizer
+            elif ML_CONFIG['text_features'] != 'hashing' and tfidf_path.exists():
+                # Predictor stopped early (e.g. no model); the registry still loads the file only once
+                self.processor.tfidf_vectorizer = artifact_registry.load(
+                    'tfidf_vectorizer', tfidf_path, lambda: load_pickle(tfidf_path)
+                )
+            if self.processor.tfidf_vectorizer is not None:
+                logger.info("✅ Data processor TF-IDF shared with predictor")
+        except Exception as e:
+            logger.warning(f"⚠️ Processor loading failed: {e}")
+        
+        # Training-side features detect and encode brands with the same vocabulary;
+        # the predictor keeps no LabelEncoder, so the processor has none either
+        self.processor.brand_vocabulary = self.predictor.brand_vocabulary
+        self.processor.brand_encoder = None
+    
+    def _load_candidate(self, model_dir, version):
+        """Load and validate a model version without activating it (blocking)"""
+        candidate = self.predictor.load_bundle(model_dir, version)
+        try:
+            self.predictor.validate_bundle(candidate)
+            # Process workers load their own copy; they must be ready before the swap
+            self.inference_pool.use_model(model_dir, version, candidate.version)
+        except Exception:
+            self._release_artifacts(candidate, keep=self.predictor.bundle)
+            raise
+        return candidate
+    
+    @staticmethod
+    def _release_artifacts(bundle, keep):
+        for name in set(bundle.artifact_names) - set(keep.artifact_names):
+            artifact_registry.evict(name)
+    
+    async def reload_model(self, version: str) -> Dict:
+        """Load a version from MODEL_VERSIONS_DIR in the background, validate it and swap it in.
+        
+        Requests keep being served by the active model while the candidate
+        loads; the swap replaces every artifact at once, so no request mixes
+        two versions. Raises ValueError/FileNotFoundError for unknown
+        versions and ModelValidationError if the candidate fails its checks.
+        """
+        if self._reload_lock.locked():
+            raise ModelReloadInProgress("A model reload is already running")
+        
+        async with self._reload_lock:
+            start_time = time.time()
+            model_dir = self.predictor.version_dir(version)
+            logger.info(f"🔄 Loading model version {version} from {model_dir}")
+            try:
+                candidate = await asyncio.to_thread(self._load_candidate, model_dir, version)
+            except Exception as e:
+                self.reload_history.append({
+                    'version': version,
+                    'status': 'failed',
+                    'error': str(e),
+                    'timestamp': datetime.now().isoformat()
+                })
+                logger.error(f"❌ Model version {version} rejected: {e}")
+                raise
+            
+            with self._swap_lock:
+                previous = self.predictor.activate(candidate)
+                self.prediction_cache.bind_version(candidate.version)
+            self._share_processor_artifacts()
+            self._release_artifacts(previous, keep=candidate)
+            
+            result = {
+                'version': version,
+                'status': 'active',
+                'model_version': candidate.version,
+                'previous_version': previous.label,
+                'reload_seconds': round(time.time() - start_time, 3),
+                'timestamp': datetime.now().isoformat()
+            }
+            self.reload_history.append(result)
+            logger.info(f"✅ Model version {version} active ({candidate.version}), replaced {previous.label}")
+            return result
+    
     async def predict_with_monitoring(self, title: str, description: str = "") -> Dict:
         """Enhanced prediction with performance monitoring and caching"""
         start_time = time.time()
         
-        # Create cache key
-        cache_key = hash(f"{title}_{description}")
+        # Features are extracted once and also provide the normalized cache key
+        features = self.predictor.extract_features(title, description)
+        with self._swap_lock:
+            version = self.predictor.model_version
+            self.prediction_cache.bind_version(version)
+        cache_key = prediction_cache_key(features.combined_text, version)
         
         # Check cache
-        if cache_key in self.prediction_cache:
+        cached_result = self.prediction_cache.get(cache_key)
+        if cached_result is not None:
             self.performance_metrics['cache_hits'] += 1
-            cached_result = self.prediction_cache[cache_key]
             cached_result['cached'] = True
+            self.live_stats.record(time.time() - start_time, cached_result['predicted_price'], cached=True)
             return cached_result
         
         try:
-            # Make prediction
-            price = self.predictor.predict_price(title, description)
-            confidence = self.predictor.get_confidence(title, description)
-            key_features = self.predictor.get_key_features(title, description)
+            # Make prediction on the worker pool, batched with concurrent requests
+            if self.batching_enabled:
+                prediction = await self.micro_batcher.submit(features)
+            else:
+                prediction = await self.inference_pool.predict(features)
+            price = prediction['predicted_price']
+            confidence = prediction['confidence_score']
+            key_features = prediction['key_features']
             
             # Calculate response time
             response_time = time.time() - start_time
@@ -89,11 +219,8 @@ class ModelService:
                 'cached': False
             }
             
-            # Cache result (keep last 100)
-            if len(self.prediction_cache) >= 100:
-                oldest_key = next(iter(self.prediction_cache))
-                del self.prediction_cache[oldest_key]
-            self.prediction_cache[cache_key] = result.copy()
+            # Cache result (bounded LRU) under the version that scored it
+            self._cache_result(features.combined_text, prediction['model_version'], result)
             
             # Update metrics
             self.performance_metrics['total_predictions'] += 1
@@ -102,23 +229,79 @@ class ModelService:
                 self.performance_metrics['total_predictions']
             )
             
-            # Add to history (keep last 50)
+            self.live_stats.record(response_time, price)
+            
+            # Add to history (keeps last 50)
             self.prediction_history.append({
                 'title': title[:50] + '...' if len(title) > 50 else title,
                 'price': price,
                 'confidence': confidence,
                 'timestamp': datetime.now().isoformat()
             })
-            if len(self.prediction_history) > 50:
-                self.prediction_history.pop(0)
             
             return result
             
+        except InferenceQueueFull:
+            raise
         except Exception as e:
             self.performance_metrics['error_count'] += 1
+            self.live_stats.record_error()
             logger.error(f"Prediction failed: {e}")
             raise
     
+    def _cache_result(self, normalized_text, scored_version, result):
+        """Cache a result under the model version that scored it, unless a reload has replaced that version"""
+        with self._swap_lock:
+            if scored_version == self.predictor.model_version:
+                self.prediction_cache.set(prediction_cache_key(normalized_text, scored_version), result)
+    
+    async def predict_batch_with_monitoring(self, products: List[Dict]) -> Dict:
+        """Score many products with one vectorized model call"""
+        start_time = time.time()
+        
+        try:
+            titles = [str(p.get('title', '') or '') for p in products]
+            descriptions = [str(p.get('description', '') or '') for p in products]
+            predictions = await self.inference_pool.predict_batch(titles, descriptions)
+            
+            response_time = time.time() - start_time
+            per_item_time = response_time / max(1, len(predictions))
+            
+            # Update metrics
+            for prediction in predictions:
+                self.performance_metrics['total_predictions'] += 1
+                self.performance_metrics['avg_response_time'] += (
+                    (per_item_time - self.performance_metrics['avg_response_time']) /
+                    self.performance_metrics['total_predictions']
+                )
+                self.live_stats.record(per_item_time, prediction['predicted_price'])
+            
+            return {
+                'predictions': predictions,
+                'count': len(predictions),
+                'response_time': round(response_time, 3),
+                'model_used': 'ML Model' if self.predictor.model_loaded else 'Advanced Heuristics',
+                'timestamp': datetime.now().isoformat()
+            }
+            
+        except InferenceQueueFull:
+            raise
+        except Exception as e:
+            self.performance_metrics['error_count'] += 1
+            self.live_stats.record_error()
+            logger.error(f"Batch prediction failed: {e}")
+            raise
+    
+    def get_model_stats(self):
+        """Model statistics plus load time and memory of each artifact"""
+        return {
+            **self.predictor.get_model_stats(),
+            **self.predictor.bundle.to_dict(),
+            "available_versions": self.predictor.available_versions(),
+            "reload_history": list(self.reload_history),
+            "artifacts": artifact_registry.stats()
+        }
+    
     def get_model_status(self):
         """Get comprehensive model status"""
         return {
@@ -131,7 +314,12 @@ class ModelService:
             "trained_models": {
                 "lgbm_model": self.predictor.model is not None,
                 "tfidf_vectorizer": self.predictor.tfidf_vectorizer is not None,
-                "brand_encoder": self.predictor.brand_encoder is not None
+                "brand_encoder": self.predictor.brand_vocabulary.source != 'builtin'
+            },
+            "brand_vocabulary": {
+                "version": self.predictor.brand_vocabulary.version,
+                "brands": len(self.predictor.brand_vocabulary),
+                "source": self.predictor.brand_vocabulary.source
             }
         }
     
@@ -140,8 +328,8 @@ class ModelService:
         try:
             start_time = time.time()
             
-            # Test prediction
-            test_prediction = self.predictor.predict_price("iPhone 14 Pro Max", "Latest Apple smartphone with advanced features")
+            # Probe the pool without queueing work: a busy or full pool is still healthy
+            workers_alive = self.inference_pool.workers_alive()
             
             # Test processor if available
             processor_status = "loaded" if self.processor.tfidf_vectorizer is not None else "fallback"
@@ -149,18 +337,18 @@ class ModelService:
             response_time = time.time() - start_time
             
             return {
-                "status": "healthy",
+                "status": "healthy" if workers_alive else "unhealthy",
                 "model_loaded": self.predictor.model_loaded,
+                "model_version": self.predictor.model_version,
+                "inference_workers_alive": workers_alive,
                 "processor_status": processor_status,
-                "test_prediction": test_prediction,
                 "response_time": round(response_time, 3),
                 "service": "AmazeWorth Smart Price Engine",
                 "version": "2.1.0",
                 "uptime": str(datetime.now() - self.performance_metrics['last_updated']),
-                "cache_performance": {
-                    "size": len(self.prediction_cache),
-                    "hit_rate": round(self.performance_metrics['cache_hits'] / max(1, self.performance_metrics['total_predictions']) * 100, 2)
-                }
+                "cache_performance": self.prediction_cache.stats(),
+                "inference_pool": self.inference_pool.stats(),
+                "micro_batching": self.micro_batcher.get_stats()
             }
         except Exception as e:
             logger.error(f"Health check failed: {e}")
@@ -175,7 +363,7 @@ class ModelService:
         """Get comprehensive analytics data"""
         return {
             "performance_metrics": self.performance_metrics,
-            "prediction_history": self.prediction_history[-20:],  # Last 20 predictions
+            "prediction_history": list(self.prediction_history)[-20:],  # Last 20 predictions
             "model_stats": self.predictor.get_model_stats(),
             "feature_importance": self.predictor.get_feature_importance(),
             "performance_comparison": self.predictor.get_performance_data(),
@@ -187,6 +375,12 @@ class ModelService:
             }
         }
     
+    async def shutdown(self):
+        """Stop the micro-batcher and the inference workers"""
+        await self.micro_batcher.stop()
+        self.inference_pool.shutdown()
+        logger.info("🛑 Inference pool stopped")
+    
     def clear_cache(self):
         """Clear prediction cache"""
         self.prediction_cache.clear()
@@ -201,6 +395,9 @@ class ModelService:
             'error_count': 0,
             'last_updated': datetime.now()
         }
+        self.live_stats.reset()
+        self.micro_batcher.stats.reset()
+        self.prediction_cache.reset_stats()
         logger.info("📊 Performance metrics reset")
 
 # Global service instance
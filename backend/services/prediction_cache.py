@@ -0,0 +1,414 @@
+"""
+Prediction cache backends: in-process LRU/TTL and a host-wide SQLite store
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Approximate per-entry bookkeeping overhead (key, OrderedDict node, tuple)
+ENTRY_OVERHEAD_BYTES = 200
+
+
+def prediction_cache_key(normalized_text: str, model_version: Optional[str] = None) -> str:
+    """Stable digest of the normalized product text and the model version"""
+    payload = f"{model_version or ''}\x00{normalized_text}".encode('utf-8')
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _copy_value(value: Dict) -> Dict:
+    """Copy a result dict together with any list values it holds"""
+    return {k: list(v) if isinstance(v, list) else v for k, v in value.items()}
+
+
+def _entry_size(key: str, value: Dict) -> int:
+    return len(key) + len(json.dumps(value, default=str)) + ENTRY_OVERHEAD_BYTES
+
+
+class PredictionCacheBackend(ABC):
+    """Interface shared by every prediction cache backend"""
+
+    backend_name = 'base'
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Dict[str, Any]):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    @abstractmethod
+    def bind_version(self, version: Optional[str]) -> bool:
+        """Invalidate entries of other model versions; returns True if the version changed"""
+
+    @abstractmethod
+    def reset_stats(self):
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def __len__(self):
+        ...
+
+
+class InMemoryPredictionCache(PredictionCacheBackend):
+    """Least-recently-used prediction cache bounded by entries and bytes.
+
+    Entries optionally expire after `ttl_seconds`. Values are copied on the
+    way in and out, so callers can annotate results without touching the
+    cached copy. `bind_version` drops every entry when the model version
+    changes.
+    """
+
+    backend_name = 'memory'
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 32 * 1024 * 1024,
+                 ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.version = None
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _copy_value(value)
+
+    def set(self, key: str, value: Dict[str, Any]):
+        value = _copy_value(value)
+        size = _entry_size(key, value)
+        if size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def bind_version(self, version: Optional[str]) -> bool:
+        """Invalidate the cache if the model version changed; returns True if it did"""
+        if version == self.version:
+            return False
+        with self._lock:
+            if version == self.version:
+                return False
+            had_entries = bool(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            self.version = version
+            if had_entries:
+                self.invalidations += 1
+        if had_entries:
+            logger.info(f"🧹 Prediction cache invalidated for model version {version}")
+        return True
+
+    def reset_stats(self):
+        with self._lock:
+            self._reset_counters()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups * 100, 2) if lookups else 0.0,
+                'model_version': self.version,
+                'backend': self.backend_name
+            }
+
+
+class SQLitePredictionCache(PredictionCacheBackend):
+    """Prediction cache shared by every worker process on a host.
+
+    Entries live in one SQLite database in WAL mode, so readers never block
+    each other. Each thread gets its own connection. Recency is refreshed
+    at most once per `touch_interval` seconds per entry to keep hits
+    read-mostly. Size limits are enforced every `prune_every` writes by
+    evicting the least recently used rows. Lock timeouts are kept short:
+    a busy database counts as a miss instead of stalling a request.
+
+    Hit/miss counters are per process; size and bytes are host-wide.
+    """
+
+    backend_name = 'sqlite'
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 100000,
+                 max_bytes: int = 256 * 1024 * 1024, ttl_seconds: Optional[float] = None,
+                 touch_interval: float = 5.0, prune_every: int = 200, busy_timeout: float = 0.05):
+        self.path = str(path or default_shared_cache_path())
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.touch_interval = touch_interval
+        self.prune_every = prune_every
+        self.busy_timeout = busy_timeout
+        self.version = None
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._reset_counters()
+
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+                " version TEXT, expires_at REAL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_predictions_access ON predictions (last_access)")
+
+    def _reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        # A connection inherited through fork() must not be used by the child
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, **increments):
+        with self._lock:
+            for name, amount in increments.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+    def __len__(self):
+        try:
+            return self._connection().execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires_at, last_access FROM predictions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._count(misses=1)
+                return None
+
+            value, expires_at, last_access = row
+            if expires_at is not None and expires_at <= now:
+                conn.execute("DELETE FROM predictions WHERE key = ?", (key,))
+                self._count(expirations=1, misses=1)
+                return None
+
+            if now - last_access >= self.touch_interval:
+                conn.execute("UPDATE predictions SET last_access = ? WHERE key = ?", (now, key))
+
+            self._count(hits=1)
+            return json.loads(value)
+
+        except sqlite3.Error as e:
+            self._count(errors=1, misses=1)
+            logger.debug(f"Shared cache read failed: {e}")
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]):
+        payload = json.dumps(value, default=str)
+        size = len(key) + len(payload) + ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds else None
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO predictions (key, value, size, version, expires_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, size, self.version, expires_at, now)
+            )
+            with self._lock:
+                self._writes += 1
+                prune = self._writes % self.prune_every == 0
+            if prune:
+                self._prune(conn, now)
+
+        except sqlite3.Error as e:
+            self._count(errors=1)
+            logger.debug(f"Shared cache write failed: {e}")
+
+    def _prune(self, conn: sqlite3.Connection, now: float):
+        """Drop expired rows, then least recently used rows beyond the limits"""
+        expired = conn.execute(
+            "DELETE FROM predictions WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        ).rowcount
+        count, total_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM predictions").fetchone()
+
+        excess = max(0, count - self.max_entries)
+        if total_bytes > self.max_bytes and count:
+            # Average entry size gives the number of rows to drop for the byte limit
+            excess = max(excess, int((total_bytes - self.max_bytes) / (total_bytes / count)) + 1)
+
+        evicted = 0
+        if excess:
+            evicted = conn.execute(
+                "DELETE FROM predictions WHERE key IN"
+                " (SELECT key FROM predictions ORDER BY last_access LIMIT ?)", (excess,)
+            ).rowcount
+        self._count(expirations=expired, evictions=evicted)
+
+    def clear(self):
+        try:
+            self._connection().execute("DELETE FROM predictions")
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Shared cache clear failed: {e}")
+
+    def bind_version(self, version: Optional[str]) -> bool:
+        if version == self.version:
+            return False
+        with self._lock:
+            if version == self.version:
+                return False
+            self.version = version
+        try:
+            removed = self._connection().execute(
+                "DELETE FROM predictions WHERE version IS NOT ?", (version,)
+            ).rowcount
+            if removed:
+                self._count(invalidations=1)
+                logger.info(f"🧹 Shared prediction cache invalidated for model version {version}")
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Shared cache invalidation failed: {e}")
+        return True
+
+    def reset_stats(self):
+        with self._lock:
+            self._reset_counters()
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            size, total_bytes = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM predictions"
+            ).fetchone()
+        except sqlite3.Error:
+            size, total_bytes = None, None
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': size,
+                'bytes': total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'errors': self.errors,
+                'hit_rate': round(self.hits / lookups * 100, 2) if lookups else 0.0,
+                'model_version': self.version,
+                'backend': self.backend_name,
+                'path': self.path
+            }
+
+
+def default_shared_cache_path() -> Path:
+    """Host-local location for the shared cache, preferring tmpfs"""
+    base = Path('/dev/shm') if os.path.isdir('/dev/shm') else Path(tempfile.gettempdir())
+    return base / 'amazeworth_prediction_cache.sqlite'
+
+
+def create_prediction_cache(config: Dict[str, Any]) -> PredictionCacheBackend:
+    """Build the cache backend selected in CACHE_CONFIG"""
+    backend = config.get('backend', 'memory')
+    limits = {
+        'max_entries': config['max_entries'],
+        'max_bytes': config['max_bytes'],
+        'ttl_seconds': config.get('ttl_seconds')
+    }
+
+    if backend == 'sqlite':
+        try:
+            return SQLitePredictionCache(path=config.get('path'), **limits)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Shared prediction cache unavailable ({e}), using in-process cache")
+    elif backend != 'memory':
+        logger.warning(f"⚠️ Unknown prediction cache backend '{backend}', using in-process cache")
+
+    return InMemoryPredictionCache(**limits)
@@ -0,0 +1,246 @@
+"""
+Constant-memory streaming statistics for live prediction traffic
+"""
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class RunningMoments:
+    """Welford running mean/variance with min and max; mergeable"""
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'RunningMoments'):
+        """Combine another set of moments into this one (Chan et al.)"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self, digits: int = 4) -> Dict:
+        if self.count == 0:
+            return {'count': 0, 'mean': 0.0, 'std': 0.0, 'min': 0.0, 'max': 0.0}
+        return {
+            'count': self.count,
+            'mean': round(self.mean, digits),
+            'std': round(self.std, digits),
+            'min': round(self.min, digits),
+            'max': round(self.max, digits)
+        }
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch (DDSketch-style) for positive values.
+
+    Every quantile estimate is within `relative_accuracy` of the true value.
+    Bucket counts simply add, so sketches from several workers or time
+    windows merge exactly. Once `max_buckets` is reached the lowest buckets
+    are collapsed, which keeps memory fixed and preserves the upper tail.
+    """
+
+    __slots__ = ('relative_accuracy', 'max_buckets', '_log_gamma', 'buckets', 'zero_count', 'count')
+
+    # Values at or below this are counted in a single zero bucket
+    MIN_VALUE = 1e-9
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._log_gamma = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float):
+        self.count += 1
+        if value <= self.MIN_VALUE:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other: 'QuantileSketch'):
+        if other._log_gamma != self._log_gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self):
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.max_buckets
+        folded = sum(self.buckets.pop(key) for key in keys[:excess + 1])
+        self.buckets[keys[excess]] = folded
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile q in [0, 1], or None when empty"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # Midpoint of the bucket (gamma^(k-1), gamma^k] in relative terms
+                return 2 * math.exp(key * self._log_gamma) / (1 + math.exp(self._log_gamma))
+        return None
+
+    def quantiles(self, qs=(0.5, 0.95, 0.99), digits: int = 4) -> Dict[str, Optional[float]]:
+        result = {}
+        for q in qs:
+            value = self.quantile(q)
+            result[f"p{round(q * 100):g}"] = round(value, digits) if value is not None else None
+        return result
+
+
+class RollingWindow:
+    """Per-interval counters kept in a fixed-size ring buffer.
+
+    Each slot remembers which interval it belongs to, so slots left over
+    from an earlier pass around the ring are reset lazily on write and
+    skipped on read.
+    """
+
+    FIELDS = ('requests', 'errors', 'cache_hits', 'latency_sum')
+
+    def __init__(self, slots: int = 60, interval_seconds: int = 60):
+        self.slots = slots
+        self.interval_seconds = interval_seconds
+        self._interval = [-1] * slots
+        self._values = {field: [0.0] * slots for field in self.FIELDS}
+
+    def _slot(self, now: float) -> int:
+        interval = int(now // self.interval_seconds)
+        index = interval % self.slots
+        if self._interval[index] != interval:
+            self._interval[index] = interval
+            for values in self._values.values():
+                values[index] = 0.0
+        return index
+
+    def add(self, now: float, **increments):
+        index = self._slot(now)
+        for field, amount in increments.items():
+            self._values[field][index] += amount
+
+    def series(self, now: float) -> List[Dict]:
+        """Counters for every interval in the window, oldest first"""
+        current = int(now // self.interval_seconds)
+        result = []
+        for interval in range(current - self.slots + 1, current + 1):
+            index = interval % self.slots
+            live = self._interval[index] == interval
+            row = {'start': interval * self.interval_seconds}
+            for field, values in self._values.items():
+                row[field] = values[index] if live else 0.0
+            result.append(row)
+        return result
+
+
+class PredictionStats:
+    """Streaming statistics fed by every served prediction"""
+
+    def __init__(self, window_minutes: int = 60):
+        self._lock = threading.Lock()
+        self.window_minutes = window_minutes
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self.latency = RunningMoments()
+            self.latency_sketch = QuantileSketch()
+            self.price = RunningMoments()
+            self.price_sketch = QuantileSketch()
+            self.window = RollingWindow(slots=self.window_minutes, interval_seconds=60)
+
+    def record(self, latency: float, price: float, cached: bool = False):
+        now = time.time()
+        with self._lock:
+            self.latency.update(latency)
+            self.latency_sketch.add(latency)
+            self.price.update(price)
+            self.price_sketch.add(price)
+            self.window.add(now, requests=1, cache_hits=int(cached), latency_sum=latency)
+
+    def record_error(self):
+        with self._lock:
+            self.window.add(time.time(), requests=1, errors=1)
+
+    def snapshot(self) -> Dict:
+        """Current latency/price distributions and per-minute throughput"""
+        now = time.time()
+        with self._lock:
+            series = self.window.series(now)
+            latency = {**self.latency.to_dict(6), **self.latency_sketch.quantiles(digits=6)}
+            price = {**self.price.to_dict(2), **self.price_sketch.quantiles(digits=2)}
+
+        # The current minute is still filling up, so rates use the last complete one
+        last_minute = series[-2] if len(series) > 1 else series[-1]
+        elapsed_minutes = min(self.window_minutes, max(1.0, (now - self.started_at) / 60))
+        window_requests = sum(row['requests'] for row in series)
+
+        return {
+            'latency_seconds': latency,
+            'predicted_price': price,
+            'throughput': {
+                'last_minute': int(last_minute['requests']),
+                'current_minute': int(series[-1]['requests']),
+                'avg_per_minute': round(window_requests / elapsed_minutes, 2),
+                'window_minutes': self.window_minutes
+            },
+            'per_minute': [
+                {
+                    'minute': time.strftime('%Y-%m-%dT%H:%M', time.localtime(row['start'])),
+                    'requests': int(row['requests']),
+                    'errors': int(row['errors']),
+                    'cache_hits': int(row['cache_hits']),
+                    'avg_latency': round(row['latency_sum'] / (row['requests'] - row['errors']), 6)
+                    if row['requests'] > row['errors'] else 0.0
+                }
+                for row in series if row['requests']
+            ]
+        }
@@ -0,0 +1,7 @@
+"""
+Make the backend packages (core, services, config) importable from the tests
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,49 @@
+"""
+BrandVocabulary must encode exactly as the LabelEncoder a model was trained with
+"""
+import pickle
+
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+
+from core.brand_vocabulary import BrandVocabulary
+
+# Raw classes whose normalized spellings collide ("Dell" / "DELL") or sort differently ("B&O" -> "b o")
+RAW_BRANDS = ['Dell', 'DELL', 'B&O', 'apple', 'Sony', 'unknown', 'LG Electronics', 'zeiss']
+
+
+def fitted_encoder_vocabulary(tmp_path):
+    encoder = LabelEncoder().fit(RAW_BRANDS)
+    path = tmp_path / 'brand_encoder.pkl'
+    with open(path, 'wb') as f:
+        pickle.dump(encoder, f)
+    return encoder, BrandVocabulary.from_label_encoder(path)
+
+
+def test_encoder_classes_keep_their_codes(tmp_path):
+    encoder, vocabulary = fitted_encoder_vocabulary(tmp_path)
+
+    np.testing.assert_array_equal(vocabulary.classes_, encoder.classes_)
+    np.testing.assert_array_equal(vocabulary.encode_batch(encoder.classes_), encoder.transform(encoder.classes_))
+    assert vocabulary.unknown_code == encoder.transform(['unknown'])[0]
+
+
+def test_normalized_aliases_map_to_the_original_code(tmp_path):
+    encoder, vocabulary = fitted_encoder_vocabulary(tmp_path)
+
+    assert vocabulary.encode(vocabulary.detect('new b o speaker')) == encoder.transform(['B&O'])[0]
+    assert vocabulary.encode(vocabulary.detect('sony headphones')) == encoder.transform(['Sony'])[0]
+    assert vocabulary.encode('lg electronics') == encoder.transform(['LG Electronics'])[0]
+    # 'DELL' sorts before 'Dell', so their shared alias keeps the first index
+    assert vocabulary.encode('dell') == encoder.transform(['DELL'])[0]
+    assert vocabulary.encode('Dell') == encoder.transform(['Dell'])[0]
+    assert vocabulary.encode('not a brand') == vocabulary.unknown_code
+
+
+def test_saved_vocabulary_keeps_encoder_codes(tmp_path):
+    encoder, vocabulary = fitted_encoder_vocabulary(tmp_path)
+    vocabulary.save(tmp_path / 'brand_vocabulary.json')
+
+    reloaded = BrandVocabulary.from_file(tmp_path / 'brand_vocabulary.json')
+    np.testing.assert_array_equal(reloaded.encode_batch(encoder.classes_), encoder.transform(encoder.classes_))
+    assert reloaded.version == vocabulary.version
@@ -0,0 +1,66 @@
+"""
+FastTfidfVectorizer transforms text exactly like the sklearn vectorizer it was built from
+"""
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from core.fast_tfidf import FastTfidfVectorizer
+
+CORPUS = [
+    'apple iphone 14 pro max 256gb',
+    'samsung galaxy tab s9 ultra tablet',
+    'sony wh 1000xm5 wireless headphones',
+    'apple watch ultra titanium case',
+    'café crème brûlée gift set',
+    'naïve résumé template café edition',
+    'lenovo thinkpad laptop pro 512gb',
+    'samsung galaxy watch pro',
+] * 2
+
+DOCS = [
+    'apple iphone pro max',
+    'Café Crème naïve résumé',
+    'ÜBER größe straße 東京 apple',
+    'unseen words only',
+    '',
+    '   ',
+    'the and of',
+    'The AND of the',
+    '!!! ??? ...',
+    'samsung galaxy tab s9 ultra tablet samsung galaxy',
+]
+
+
+@pytest.fixture(scope='module')
+def vectorizers():
+    # Same text settings as DataProcessor.text_features_matrix
+    reference = TfidfVectorizer(max_features=10000, ngram_range=(1, 2), min_df=2, stop_words='english').fit(CORPUS)
+    return reference, FastTfidfVectorizer.from_sklearn(reference)
+
+
+def assert_same_csr(actual, expected):
+    actual, expected = actual.tocsr(), expected.tocsr()
+    assert actual.shape == expected.shape
+    np.testing.assert_array_equal(actual.indptr, expected.indptr)
+    np.testing.assert_array_equal(actual.indices, expected.indices)
+    np.testing.assert_allclose(actual.data, expected.data, rtol=1e-12, atol=0)
+
+
+@pytest.mark.parametrize('doc', DOCS)
+def test_single_document_matches_sklearn(vectorizers, doc):
+    reference, fast = vectorizers
+    assert_same_csr(fast.transform([doc]), reference.transform([doc]))
+
+
+def test_batch_matches_sklearn(vectorizers):
+    reference, fast = vectorizers
+    assert_same_csr(fast.transform(DOCS + CORPUS), reference.transform(DOCS + CORPUS))
+
+
+@pytest.mark.parametrize('doc', ['', '   ', 'the and of', '!!! ??? ...', 'unseen words only'])
+def test_documents_without_known_terms_give_empty_rows(vectorizers, doc):
+    _, fast = vectorizers
+    X = fast.transform([doc])
+    assert X.shape == (1, len(fast.vocabulary))
+    assert X.nnz == 0
@@ -0,0 +1,73 @@
+"""
+FeatureAssembler builds the same rows as hstack with far less memory per single row
+"""
+import tracemalloc
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix, hstack
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from core.fast_tfidf import FastTfidfVectorizer
+from core.feature_assembly import NUMERIC_COLUMNS, FeatureAssembler
+
+CORPUS = [
+    'apple iphone 14 pro max 256gb deep purple',
+    'samsung 55 inch qled smart tv with alexa',
+    'organic cold brew coffee concentrate 32 fl oz',
+    'dell xps 13 laptop 16gb ram 512gb ssd professional edition',
+] * 3
+DOC = 'dell xps 13 laptop 16gb ram 512gb ssd professional edition'
+TAIL = (len(DOC), len(DOC.split()), 8, 1)
+
+# About 30x here and 19x with the shipped vocabulary (benchmarks/bench_feature_assembly.py)
+MIN_SINGLE_ROW_PEAK_RATIO = 10
+
+
+@pytest.fixture(scope='module')
+def vectorizer():
+    reference = TfidfVectorizer(max_features=10000, ngram_range=(1, 2), min_df=2, stop_words='english').fit(CORPUS)
+    return FastTfidfVectorizer.from_sklearn(reference)
+
+
+def hstack_row(indices, values, assembler):
+    """Single-row assembly as done before FeatureAssembler"""
+    text = csr_matrix((np.array(values), np.array(indices, dtype=np.int32), np.array([0, len(indices)], dtype=np.int32)),
+                      shape=(1, assembler.n_text_features))
+    return hstack([text, csr_matrix(np.array([TAIL], dtype=np.float64))], format='csr')
+
+
+def assembled_row(indices, values, assembler):
+    return assembler.row(indices, values, TAIL)
+
+
+def peak_bytes(build, *args):
+    build(*args)
+    tracemalloc.start()
+    try:
+        build(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_row_matches_hstack(vectorizer):
+    assembler = FeatureAssembler.for_vectorizer(vectorizer)
+    indices, values = vectorizer.row(DOC)
+    expected = hstack_row(indices, values, assembler)
+    actual = assembled_row(indices, values, assembler)
+
+    assert actual.shape == (1, len(vectorizer.vocabulary) + len(NUMERIC_COLUMNS))
+    np.testing.assert_array_equal(actual.indptr, expected.indptr)
+    np.testing.assert_array_equal(actual.indices, expected.indices)
+    np.testing.assert_array_equal(actual.data, expected.data)
+
+
+def test_single_row_peak_memory_is_a_fraction_of_hstack(vectorizer):
+    assembler = FeatureAssembler.for_vectorizer(vectorizer)
+    # Vectorizing is the same for both and stays outside the measurement
+    indices, values = vectorizer.row(DOC)
+    old_peak = peak_bytes(hstack_row, indices, values, assembler)
+    new_peak = peak_bytes(assembled_row, indices, values, assembler)
+
+    assert old_peak / new_peak >= MIN_SINGLE_ROW_PEAK_RATIO, f"{old_peak} -> {new_peak} bytes"
@@ -0,0 +1,54 @@
+"""
+Out-of-core TF-IDF fitting matches the in-memory fit, whatever the chunks contain
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from core.feature_assembly import NUMERIC_COLUMNS
+from core.out_of_core_tfidf import fit_tfidf_out_of_core
+from core.processor import DataProcessor
+
+TITLES = ['apple iphone pro max', 'samsung galaxy tablet', 'acme rocket skates', 'apple watch ultra'] * 5
+# Stop words only, or nothing at all once cleaned
+EMPTY_TITLES = ['the', 'and', '', 'the and', '!!!'] * 2
+
+
+def chunked(texts, size):
+    return lambda: (texts[i:i + size] for i in range(0, len(texts), size))
+
+
+def test_stop_word_only_chunk_is_skipped_but_counted():
+    texts = TITLES[:10] + EMPTY_TITLES + TITLES[10:]
+    reference = TfidfVectorizer(max_features=10000, ngram_range=(1, 2), min_df=2, stop_words='english').fit(texts)
+
+    vectorizer = fit_tfidf_out_of_core(chunked(texts, 10))
+
+    assert vectorizer.vocabulary_ == reference.vocabulary_
+    np.testing.assert_allclose(vectorizer.idf_, reference.idf_)
+
+
+def test_processor_fits_csv_with_stop_word_only_chunk(tmp_path):
+    path = tmp_path / 'train.csv'
+    pd.DataFrame({'title': EMPTY_TITLES + TITLES, 'description': '', 'price': 10.0}).to_csv(path, index=False)
+
+    vectorizer = DataProcessor().fit_text_vectorizer_out_of_core(path, chunk_rows=10)
+
+    assert 'apple' in vectorizer.vocabulary_
+    assert vectorizer.transform(['apple iphone']).nnz > 0
+
+
+def test_streaming_requires_a_fitted_vectorizer(tmp_path):
+    path = tmp_path / 'train.csv'
+    pd.DataFrame({'title': TITLES, 'description': '', 'price': 10.0}).to_csv(path, index=False)
+    processor = DataProcessor()
+
+    with pytest.raises(ValueError, match='not fitted'):
+        next(processor.iter_training_matrices(path, chunk_rows=10))
+
+    vectorizer = processor.fit_text_vectorizer_out_of_core(path, chunk_rows=10)
+    X, y = next(processor.iter_training_matrices(path, chunk_rows=10))
+    assert processor.tfidf_vectorizer is vectorizer
+    assert X.shape == (10, len(vectorizer.vocabulary_) + len(NUMERIC_COLUMNS))
+    np.testing.assert_allclose(y, np.log1p(10.0))
@@ -0,0 +1,53 @@
+"""
+DataProcessor artifacts survive a save/load round trip
+"""
+import numpy as np
+import pandas as pd
+
+from core.brand_vocabulary import BrandVocabulary
+from core.processor import DataProcessor
+
+TRAIN = pd.DataFrame({
+    'title': ['Apple iPhone 14 Pro', 'Acme Rocket Skates', 'Samsung Galaxy Tab', 'Acme Anvil Deluxe'] * 3,
+    'description': ['Premium phone', None, 'Android tablet', 'Heavy duty'] * 3,
+})
+
+
+def saved_paths(tmp_path):
+    return tmp_path / 'tfidf_vectorizer.pkl', tmp_path / 'brand_encoder.pkl', tmp_path / 'brand_vocabulary.json'
+
+
+def test_trained_processor_round_trip(tmp_path):
+    processor = DataProcessor()
+    # A non-default vocabulary, so a reload falling back to the built-in brands changes the codes
+    processor.brand_vocabulary = BrandVocabulary(['acme', 'samsung', 'apple'], source='test')
+    X = processor.build_training_matrix(TRAIN)
+    tfidf_path, encoder_path, vocabulary_path = saved_paths(tmp_path)
+    processor.save_processors(tfidf_path, encoder_path, vocabulary_path)
+    assert not encoder_path.exists()
+
+    reloaded = DataProcessor()
+    reloaded.load_processors(tfidf_path, encoder_path, vocabulary_path)
+
+    assert reloaded.brand_encoder is None
+    assert reloaded.brand_vocabulary.version == processor.brand_vocabulary.version
+    assert reloaded.brand_vocabulary.encode('acme') == processor.brand_vocabulary.encode('acme')
+    X_reloaded = reloaded.build_training_matrix(TRAIN)
+    assert X_reloaded.shape == X.shape
+    assert abs(X_reloaded - X).max() == 0
+
+
+def test_load_falls_back_to_saved_encoder(tmp_path):
+    from sklearn.preprocessing import LabelEncoder
+
+    processor = DataProcessor()
+    processor.build_training_matrix(TRAIN)
+    processor.brand_encoder = LabelEncoder().fit(['Acme', 'apple', 'unknown'])
+    tfidf_path, encoder_path, _ = saved_paths(tmp_path)
+    processor.save_processors(tfidf_path, encoder_path)
+
+    reloaded = DataProcessor()
+    reloaded.load_processors(tfidf_path, encoder_path)
+
+    np.testing.assert_array_equal(reloaded.brand_vocabulary.classes_, processor.brand_encoder.classes_)
+    assert reloaded.brand_vocabulary.encode('acme') == processor.brand_encoder.transform(['Acme'])[0]